@@ -2,28 +2,196 @@
 Enhanced scoring module with advanced AI-powered analysis.
 Provides more nuanced, intelligent comparable matching.
 """
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from openai import OpenAI
 import numpy as np
+import hashlib
+import orjson
 import logging
+import re
+import threading
+
+# SIMD cosine kernels (graceful degradation to NumPy if not installed)
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
+
+# Multi-keyword matcher for focus areas (falls back to substring scans)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Customer segments checked by _analyze_customer_overlap. The lookahead
+# keeps the original substring semantics (no word boundaries) and reports
+# overlapping hits, e.g. both 'b2b' and 'b2c' in 'b2b2c'.
+CUSTOMER_TYPES = [
+    'enterprise', 'government', 'healthcare', 'financial', 
+    'retail', 'manufacturing', 'education', 'startups',
+    'smb', 'mid-market', 'consumers', 'b2b', 'b2c'
+]
+_CUSTOMER_RE = re.compile('(?=(' + '|'.join(re.escape(k) for k in CUSTOMER_TYPES) + '))')
+
+# Bump when the business model prompt changes so old cache entries miss
+BUSINESS_MODEL_LLM = "gpt-4o-mini"
+BUSINESS_MODEL_PROMPT_VERSION = "v1"
+BUSINESS_MODEL_CACHE_NAMESPACE = f"{BUSINESS_MODEL_LLM}:{BUSINESS_MODEL_PROMPT_VERSION}"
+
+
+class LLMResultCache:
+    """
+    Thread-safe LRU of prompt fingerprint -> LLM result.
+    
+    Fingerprints hash the model, prompt version and every prompt field, so
+    a hit is only ever served for an identical prompt.
+    """
+    
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            return result
+    
+    def put(self, key: str, result: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of description text -> embedding."""
+    
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, text: str) -> Optional[np.ndarray]:
+        with self._lock:
+            embedding = self._entries.get(text)
+            if embedding is not None:
+                self._entries.move_to_end(text)
+            return embedding
+    
+    def put(self, text: str, embedding: np.ndarray):
+        with self._lock:
+            self._entries[text] = embedding
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# Shared across engines so repeated rescoring runs hit the cache
+_business_model_cache = LLMResultCache()
+_embedding_cache = EmbeddingCache()
+
 
 class AdvancedScoringEngine:
     """
     Enhanced scoring with multi-dimensional analysis.
     """
     
-    def __init__(self, client: OpenAI):
+    # OpenAI caps the number of inputs per embeddings request
+    EMBEDDING_BATCH_SIZE = 2048
+    
+    # Comparables packed into each business model prompt
+    BUSINESS_MODEL_BATCH_SIZE = 8
+    
+    # Comparable embeddings are stored at half precision; cosine ranking on
+    # text-embedding-3-small is insensitive to it and it halves memory traffic
+    EMBEDDING_DTYPE = np.float16
+    
+    def __init__(
+        self,
+        client: OpenAI,
+        llm_cache: Optional[LLMResultCache] = None
+    ):
         self.client = client
+        self._llm_cache = llm_cache or _business_model_cache
+        # Focus areas are shared by every comparable in a rescore, so the
+        # automaton is built once and reused until the areas change
+        self._focus_automaton_key: Optional[Tuple[str, ...]] = None
+        self._focus_automaton = None
+        # Likewise the target half of every business model fingerprint is
+        # hashed once and copied per comparable
+        self._target_hasher_key: Optional[Tuple[str, str]] = None
+        self._target_hasher = None
+    
+    def precompute_embeddings(
+        self,
+        comparables: List[Dict[str, Any]]
+    ) -> Dict[int, np.ndarray]:
+        """
+        Embed all comparable descriptions in as few requests as possible.
+        
+        Identical descriptions are embedded once, and descriptions seen in
+        earlier runs are served from a shared LRU cache.
+        
+        Returns:
+            Mapping of comparable index -> embedding. Indices with an empty
+            description or whose chunk failed are omitted so callers can
+            fall back to neutral scores.
+        """
+        desc_to_indices: Dict[str, List[int]] = defaultdict(list)
+        for idx, c in enumerate(comparables):
+            desc = c.get('normalized_description', c.get('business_activity', ''))
+            # The API rejects empty inputs, which would fail the whole chunk
+            if desc and desc.strip():
+                desc_to_indices[desc].append(idx)
+        
+        unique_embeddings: Dict[str, np.ndarray] = {}
+        missing = []
+        for desc in desc_to_indices:
+            cached = _embedding_cache.get(desc)
+            if cached is not None:
+                unique_embeddings[desc] = cached
+            else:
+                missing.append(desc)
+        
+        for start in range(0, len(missing), self.EMBEDDING_BATCH_SIZE):
+            chunk = missing[start:start + self.EMBEDDING_BATCH_SIZE]
+            try:
+                resp = self.client.embeddings.create(
+                    model="text-embedding-3-small",
+                    input=chunk
+                )
+                for desc, item in zip(chunk, resp.data):
+                    embedding = np.asarray(item.embedding, dtype=self.EMBEDDING_DTYPE)
+                    unique_embeddings[desc] = embedding
+                    _embedding_cache.put(desc, embedding)
+            except Exception as e:
+                logger.error(f"Batch embedding error: {e}")
+        
+        embeddings = {}
+        for desc, embedding in unique_embeddings.items():
+            for idx in desc_to_indices[desc]:
+                embeddings[idx] = embedding
+        
+        return embeddings
     
     def calculate_advanced_score(
         self,
         comparable: Dict[str, Any],
         target: Dict[str, Any],
         analysis: Dict[str, Any],
-        target_embedding: np.ndarray
+        target_embedding: np.ndarray,
+        business_model_result: Optional[Dict[str, Any]] = None,
+        semantic_result: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Calculate comprehensive score with multiple dimensions.
@@ -34,6 +202,9 @@ class AdvancedScoringEngine:
         3. Customer overlap (LLM-based)
         4. Scale/maturity matching
         5. Financial profile similarity (if available)
+        
+        Pass business_model_result / semantic_result to reuse results that
+        were already computed for the whole batch (see rescore helpers).
         """
         scores = {}
         weights = {}
@@ -43,16 +214,22 @@ class AdvancedScoringEngine:
         weights['base'] = 1.0
         
         # 1. Semantic Similarity (enhanced)
-        semantic_result = self._calculate_semantic_similarity(
-            comparable, target_embedding
-        )
+        if semantic_result is None:
+            if '_embedding' in comparable:
+                comp_embedding = comparable['_embedding']
+            else:
+                comp_embedding = self.precompute_embeddings([comparable]).get(0)
+            semantic_result = self._calculate_semantic_similarity(
+                comp_embedding, target_embedding
+            )
         scores['semantic'] = semantic_result['score']
         weights['semantic'] = 3.5  # Increased weight
         
         # 2. Business Model Alignment (deep analysis)
-        business_model_result = self._analyze_business_model_depth(
-            comparable, target, analysis
-        )
+        if business_model_result is None:
+            business_model_result = self._analyze_business_model_depth(
+                comparable, target, analysis
+            )
         scores['business_model'] = business_model_result['score']
         weights['business_model'] = 2.0
         
@@ -99,58 +276,123 @@ class AdvancedScoringEngine:
             }
         }
     
-    def _calculate_semantic_similarity(
+    def batch_semantic_similarity(
         self,
-        comparable: Dict[str, Any],
+        embeddings: Dict[int, np.ndarray],
         target_embedding: np.ndarray
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Score every comparable embedding against the target at once.
+        
+        Stacks the embeddings so all cosine similarities come out of a
+        single matrix-vector product, with the target norm computed once.
+        """
+        if not embeddings:
+            return {}
+        
+        indices = list(embeddings)
+        # Candidates are stored FP16; the target stays FP32, so the matrix
+        # is upcast for the product rather than the query quantized
+        matrix = np.stack([embeddings[i] for i in indices]).astype(np.float32)
+        target = np.ascontiguousarray(target_embedding, dtype=np.float32)
+        
+        if SIMSIMD_AVAILABLE:
+            # One SIMD sweep returns cosine distances for every row
+            sims = 1.0 - np.asarray(
+                simsimd.cdist(target[None, :], matrix, metric="cosine"),
+                dtype=np.float32
+            ).reshape(-1)
+            valid = np.any(matrix, axis=1) & bool(np.any(target))
+        else:
+            target_norm = float(np.linalg.norm(target))
+            denominators = np.linalg.norm(matrix, axis=1) * target_norm
+            valid = denominators > 0
+            sims = np.divide(
+                matrix @ target, denominators,
+                out=np.zeros(len(indices), dtype=np.float32), where=valid
+            )
+        
+        scores = self._scale_similarities(sims)
+        confidences = np.select(
+            [sims > 0.75, sims > 0.60], ['HIGH', 'MEDIUM'], default='LOW'
+        )
+        
+        results = {}
+        for idx, sim, score, confidence, ok in zip(indices, sims, scores, confidences, valid):
+            if ok:
+                results[idx] = {
+                    'score': float(score),
+                    'raw_similarity': float(sim),
+                    'confidence': str(confidence)
+                }
+            else:
+                results[idx] = {'score': 0.5, 'raw_similarity': 0.5, 'confidence': 'ERROR'}
+        return results
+    
+    def _calculate_semantic_similarity(
+        self,
+        comp_embedding: Optional[np.ndarray],
+        target_embedding: np.ndarray,
+        target_norm: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Enhanced semantic similarity with context awareness."""
-        comp_desc = comparable.get('normalized_description', 
-                                   comparable.get('business_activity', ''))
+        """Enhanced semantic similarity from a precomputed embedding."""
+        if comp_embedding is None:
+            return {'score': 0.5, 'raw_similarity': 0.5, 'confidence': 'ERROR'}
         
         try:
-            # Get embedding
-            resp = self.client.embeddings.create(
-                model="text-embedding-3-small",
-                input=[comp_desc]
-            )
-            comp_embedding = np.array(resp.data[0].embedding)
+            if not np.any(comp_embedding) or not np.any(target_embedding):
+                return {'score': 0.5, 'raw_similarity': 0.5, 'confidence': 'ERROR'}
             
             # Calculate cosine similarity
-            similarity = float(np.dot(target_embedding, comp_embedding) / 
-                             (np.linalg.norm(target_embedding) * np.linalg.norm(comp_embedding)))
-            
-            # Enhanced scoring with non-linear scaling
-            # Rewards very high similarity, penalizes low similarity more
-            if similarity > 0.85:
-                score = 1.0
-            elif similarity > 0.75:
-                score = 0.85 + (similarity - 0.75) * 1.5
-            elif similarity > 0.60:
-                score = 0.65 + (similarity - 0.60) * 1.3
+            if SIMSIMD_AVAILABLE:
+                similarity = 1.0 - float(simsimd.cosine(
+                    np.ascontiguousarray(target_embedding, dtype=np.float32),
+                    np.ascontiguousarray(comp_embedding, dtype=np.float32)
+                ))
             else:
-                score = similarity
+                comp_embedding = np.asarray(comp_embedding, dtype=np.float32)
+                if target_norm is None:
+                    target_norm = float(np.linalg.norm(target_embedding))
+                similarity = float(np.dot(target_embedding, comp_embedding)) / (
+                    target_norm * float(np.linalg.norm(comp_embedding))
+                )
             
-            return {
-                'score': min(score, 1.0),
-                'raw_similarity': similarity,
-                'confidence': 'HIGH' if similarity > 0.75 else 'MEDIUM' if similarity > 0.60 else 'LOW'
-            }
+            return self._score_similarity(similarity)
             
         except Exception as e:
             logger.error(f"Semantic similarity error: {e}")
             return {'score': 0.5, 'raw_similarity': 0.5, 'confidence': 'ERROR'}
     
-    def _analyze_business_model_depth(
-        self,
+    @staticmethod
+    def _scale_similarities(sims: np.ndarray) -> np.ndarray:
+        """Map raw cosine similarities onto semantic scores, vectorized."""
+        # Enhanced scoring with non-linear scaling
+        # Rewards very high similarity, penalizes low similarity more
+        scores = np.select(
+            [sims > 0.85, sims > 0.75, sims > 0.60],
+            [np.ones_like(sims), 0.85 + (sims - 0.75) * 1.5, 0.65 + (sims - 0.60) * 1.3],
+            default=sims
+        )
+        return np.minimum(scores, 1.0)
+    
+    @classmethod
+    def _score_similarity(cls, similarity: float) -> Dict[str, Any]:
+        """Map a single raw cosine similarity onto the semantic score."""
+        score = float(cls._scale_similarities(np.array([similarity]))[0])
+        
+        return {
+            'score': score,
+            'raw_similarity': similarity,
+            'confidence': 'HIGH' if similarity > 0.75 else 'MEDIUM' if similarity > 0.60 else 'LOW'
+        }
+    
+    @staticmethod
+    def _build_business_model_prompt(
         comparable: Dict[str, Any],
         target: Dict[str, Any],
         analysis: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """
-        Deep business model analysis using LLM.
-        Goes beyond simple categorization.
-        """
+    ) -> str:
+        """Build the business model comparison prompt."""
         target_model = analysis.get('business_model', 'unknown')
         target_desc = target.get('description', '')[:500]
         comp_desc = comparable.get('business_activity', '')[:500]
@@ -180,27 +422,232 @@ Return ONLY JSON:
     "key_difference": "one sentence"
 }}
 """
+        return prompt
+    
+    def _analyze_business_model_depth(
+        self,
+        comparable: Dict[str, Any],
+        target: Dict[str, Any],
+        analysis: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Deep business model analysis using LLM.
+        Goes beyond simple categorization.
+        """
+        prompt = self._build_business_model_prompt(comparable, target, analysis)
+        key = self._business_model_key(comparable, target, analysis)
+        cached = self._llm_cache.get(key)
+        if cached is not None:
+            return cached
         
         try:
             resp = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+                model=BUSINESS_MODEL_LLM,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.1,
                 response_format={"type": "json_object"}
             )
             
-            import json
-            result = json.loads(resp.choices[0].message.content)
+            result = orjson.loads(resp.choices[0].message.content)
             
-            return {
+            scored = {
                 'score': result.get('overall_score', 0.5),
                 'details': result
             }
+            self._store_business_model_cache(key, scored)
+            return scored
             
         except Exception as e:
             logger.error(f"Business model analysis error: {e}")
             return {'score': 0.5, 'details': {}}
     
+    @staticmethod
+    def _build_business_model_batch_prompt(
+        comparables: List[Dict[str, Any]],
+        target: Dict[str, Any],
+        analysis: Dict[str, Any]
+    ) -> str:
+        """Build one prompt scoring several comparables against the target."""
+        target_model = analysis.get('business_model', 'unknown')
+        target_desc = target.get('description', '')[:500]
+        
+        comp_blocks = "\n\n".join(
+            f"[{idx}] {comp.get('name')}\nDescription: {comp.get('business_activity', '')[:500]}"
+            for idx, comp in enumerate(comparables)
+        )
+        
+        prompt = f"""Analyze business model similarity between the target and EACH comparable.
+
+TARGET: {target_desc}
+Target Business Model: {target_model}
+
+COMPARABLES:
+{comp_blocks}
+
+For each comparable, evaluate similarity across:
+1. Revenue model (subscription, transaction, licensing, services, etc.)
+2. Customer acquisition approach
+3. Value delivery method
+4. Operational model (asset-light vs capital-intensive)
+5. Competitive dynamics
+
+Return ONLY JSON with one entry per comparable, using its [index]:
+{{
+    "results": [
+        {{
+            "idx": 0,
+            "overall_score": 0.0-1.0,
+            "revenue_model_match": 0.0-1.0,
+            "customer_model_match": 0.0-1.0,
+            "delivery_match": 0.0-1.0,
+            "key_similarity": "one sentence",
+            "key_difference": "one sentence"
+        }}
+    ]
+}}
+"""
+        return prompt
+    
+    def _prepare_business_model_batch(
+        self,
+        comparables: List[Dict[str, Any]],
+        target: Dict[str, Any],
+        analysis: Dict[str, Any]
+    ) -> Tuple[List[Optional[Dict[str, Any]]], List[Tuple[int, str]], Optional[str]]:
+        """
+        Resolve cache hits and build a batch prompt for the rest.
+        
+        Cache keys are the single-comparable prompt fingerprints, so the
+        batch and per-comparable paths share entries.
+        
+        Returns:
+            (results with cache hits filled in, [(index, key)] still
+            pending, prompt for the pending comparables or None)
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(comparables)
+        pending = []
+        
+        for idx, comp in enumerate(comparables):
+            key = self._business_model_key(comp, target, analysis)
+            cached = self._llm_cache.get(key)
+            if cached is not None:
+                results[idx] = cached
+            else:
+                pending.append((idx, key))
+        
+        if not pending:
+            return results, pending, None
+        
+        prompt = self._build_business_model_batch_prompt(
+            [comparables[idx] for idx, _ in pending], target, analysis
+        )
+        return results, pending, prompt
+    
+    def _finish_business_model_batch(
+        self,
+        results: List[Optional[Dict[str, Any]]],
+        pending: List[Tuple[int, str]],
+        content: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Fill pending results from a batch response; misses get neutral scores."""
+        by_idx = {}
+        if content is not None:
+            try:
+                for item in orjson.loads(content).get('results', []):
+                    if isinstance(item, dict) and isinstance(item.get('idx'), int):
+                        by_idx[item['idx']] = item
+            except (orjson.JSONDecodeError, AttributeError) as e:
+                logger.error(f"Business model batch parse error: {e}")
+        
+        for batch_idx, (idx, key) in enumerate(pending):
+            item = by_idx.get(batch_idx)
+            if item is None:
+                results[idx] = {'score': 0.5, 'details': {}}
+                continue
+            scored = {
+                'score': item.get('overall_score', 0.5),
+                'details': item
+            }
+            self._store_business_model_cache(key, scored)
+            results[idx] = scored
+        
+        return results
+    
+    def _analyze_business_model_batch(
+        self,
+        comparables: List[Dict[str, Any]],
+        target: Dict[str, Any],
+        analysis: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Score several comparables in one LLM call.
+        
+        The target context is sent once per batch instead of once per
+        comparable.
+        """
+        results, pending, prompt = self._prepare_business_model_batch(
+            comparables, target, analysis
+        )
+        if not pending:
+            return results
+        
+        content = None
+        try:
+            resp = self.client.chat.completions.create(
+                model=BUSINESS_MODEL_LLM,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.1,
+                response_format={"type": "json_object"}
+            )
+            content = resp.choices[0].message.content
+        except Exception as e:
+            logger.error(f"Business model batch analysis error: {e}")
+        
+        return self._finish_business_model_batch(results, pending, content)
+    
+    def _store_business_model_cache(
+        self,
+        key: str,
+        result: Dict[str, Any]
+    ):
+        """Remember a successful business model analysis."""
+        self._llm_cache.put(key, result)
+    
+    def _business_model_key(
+        self,
+        comparable: Dict[str, Any],
+        target: Dict[str, Any],
+        analysis: Dict[str, Any]
+    ) -> str:
+        """
+        Fingerprint a single-comparable business model prompt.
+        
+        Hashes the same fields the prompt is built from, so the key changes
+        exactly when the prompt does. The target fields are hashed once per
+        target and the hasher is copied for each comparable.
+        """
+        h = self._get_target_hasher(target, analysis).copy()
+        h.update(f"{comparable.get('name')}\0".encode())
+        h.update(comparable.get('business_activity', '')[:500].encode())
+        return h.hexdigest()
+    
+    def _get_target_hasher(self, target: Dict[str, Any], analysis: Dict[str, Any]):
+        """Return a sha256 primed with the namespace and target fields."""
+        key = (
+            target.get('description', '')[:500],
+            str(analysis.get('business_model', 'unknown'))
+        )
+        if key == self._target_hasher_key:
+            return self._target_hasher
+        
+        hasher = hashlib.sha256()
+        hasher.update(f"{BUSINESS_MODEL_CACHE_NAMESPACE}\0".encode())
+        hasher.update(f"{key[0]}\0{key[1]}\0".encode())
+        
+        self._target_hasher_key = key
+        self._target_hasher = hasher
+        return hasher
+    
     def _analyze_customer_overlap(
         self,
         comparable: Dict[str, Any],
@@ -213,17 +660,13 @@ Return ONLY JSON:
         # Simple keyword matching for now
         # TODO: Could enhance with LLM analysis
         
-        overlap_keywords = []
-        customer_types = [
-            'enterprise', 'government', 'healthcare', 'financial', 
-            'retail', 'manufacturing', 'education', 'startups',
-            'smb', 'mid-market', 'consumers', 'b2b', 'b2c'
+        # One regex pass per string instead of a substring test per keyword
+        comp_hits = set(_CUSTOMER_RE.findall(comp_customers))
+        target_hits = set(_CUSTOMER_RE.findall(target_desc))
+        overlap_keywords = [
+            k for k in CUSTOMER_TYPES if k in comp_hits and k in target_hits
         ]
         
-        for keyword in customer_types:
-            if keyword in comp_customers and keyword in target_desc:
-                overlap_keywords.append(keyword)
-        
         score = min(len(overlap_keywords) * 0.25, 1.0)
         
         return {
@@ -281,15 +724,30 @@ Return ONLY JSON:
         matches = []
         partial_matches = []
         
-        for area in focus_areas:
-            area_lower = area.lower()
+        automaton = self._get_focus_automaton(focus_areas)
+        if automaton is not None:
+            # Single pass over the description finds every phrase and word
+            exact_hits, partial_hits = set(), set()
+            for _, entries in automaton.iter(comp_desc):
+                for kind, area in entries:
+                    (exact_hits if kind == 'exact' else partial_hits).add(area)
             
-            # Exact match
-            if area_lower in comp_desc:
-                matches.append(area)
-            # Partial match (check for word stems)
-            elif any(word in comp_desc for word in area_lower.split()):
-                partial_matches.append(area)
+            for area in focus_areas:
+                # Blank areas never enter the automaton; test them directly
+                if area in exact_hits or (not area.strip() and area.lower() in comp_desc):
+                    matches.append(area)
+                elif area in partial_hits:
+                    partial_matches.append(area)
+        else:
+            for area in focus_areas:
+                area_lower = area.lower()
+                
+                # Exact match
+                if area_lower in comp_desc:
+                    matches.append(area)
+                # Partial match (check for word stems)
+                elif any(word in comp_desc for word in area_lower.split()):
+                    partial_matches.append(area)
         
         # Calculate score
         exact_score = len(matches) / len(focus_areas) if focus_areas else 0
@@ -303,6 +761,37 @@ Return ONLY JSON:
             'partial_matches': partial_matches,
             'precision': f"{exact_score:.0%}"
         }
+    
+    def _get_focus_automaton(self, focus_areas: List[str]):
+        """Build (or reuse) an Aho-Corasick automaton over the focus areas."""
+        if not AHOCORASICK_AVAILABLE or not focus_areas:
+            return None
+        
+        key = tuple(focus_areas)
+        if key == self._focus_automaton_key:
+            return self._focus_automaton
+        
+        # A word can belong to several areas, so each key maps to a list
+        patterns: Dict[str, List[Tuple[str, str]]] = {}
+        for area in focus_areas:
+            area_lower = area.lower()
+            if not area_lower.strip():
+                continue
+            patterns.setdefault(area_lower, []).append(('exact', area))
+            for word in area_lower.split():
+                patterns.setdefault(word, []).append(('partial', area))
+        
+        if not patterns:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for pattern, entries in patterns.items():
+            automaton.add_word(pattern, tuple(entries))
+        automaton.make_automaton()
+        
+        self._focus_automaton_key = key
+        self._focus_automaton = automaton
+        return automaton
 
 
 def rescore_comparables_advanced(
@@ -310,16 +799,62 @@ def rescore_comparables_advanced(
     target: Dict[str, Any],
     analysis: Dict[str, Any],
     target_embedding: np.ndarray,
-    client: OpenAI
+    client: OpenAI,
+    max_concurrency: int = 10
 ) -> List[Dict[str, Any]]:
     """
     Re-score comparables with advanced engine.
+    
+    The business model batches and the embeddings request are I/O bound,
+    so they run concurrently on a pool of at most max_concurrency threads
+    to stay inside rate limits.
     """
     engine = AdvancedScoringEngine(client)
+    size = engine.BUSINESS_MODEL_BATCH_SIZE
+    chunks = [
+        comparables[start:start + size]
+        for start in range(0, len(comparables), size)
+    ]
+    # Prime the shared target hasher before worker threads fingerprint prompts
+    engine._get_target_hasher(target, analysis)
+    
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        # One embeddings request for the whole batch instead of one per comparable
+        embeddings_future = executor.submit(engine.precompute_embeddings, comparables)
+        chunk_results = list(executor.map(
+            lambda chunk: engine._analyze_business_model_batch(chunk, target, analysis),
+            chunks
+        ))
+        embeddings = embeddings_future.result()
+    business_model_results = [r for chunk in chunk_results for r in chunk]
     
-    for comp in comparables:
+    return _apply_advanced_scores(
+        engine, comparables, target, analysis, target_embedding,
+        embeddings, business_model_results
+    )
+
+
+def _apply_advanced_scores(
+    engine: AdvancedScoringEngine,
+    comparables: List[Dict[str, Any]],
+    target: Dict[str, Any],
+    analysis: Dict[str, Any],
+    target_embedding: np.ndarray,
+    embeddings: Dict[int, np.ndarray],
+    business_model_results: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """Score each comparable in place and sort by advanced score."""
+    semantic_results = engine.batch_semantic_similarity(embeddings, target_embedding)
+    
+    for idx, comp in enumerate(comparables):
         result = engine.calculate_advanced_score(
-            comp, target, analysis, target_embedding
+            comp, target, analysis, target_embedding,
+            business_model_result=(
+                business_model_results[idx] if business_model_results else None
+            ),
+            semantic_result=semantic_results.get(
+                idx, {'score': 0.5, 'raw_similarity': 0.5, 'confidence': 'ERROR'}
+            )
         )
         
         comp['advanced_score'] = result['score']
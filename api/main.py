@@ -6,11 +6,15 @@ Run with: uvicorn api.main:app --reload --port 8000
 """
 from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import orjson
+import time
+import uuid
 import sys
 import os
 
@@ -28,8 +32,8 @@ from observability import (
     get_logger, get_metrics, log_execution, track_metrics
 )
 from migrations import MigrationManager
-from etl.pipeline import FinancialETLPipeline, ETLStatus
 from database import Database
+# etl.pipeline pulls in yfinance/pandas; it is imported in lifespan instead
 
 # ============================================================================
 # Initialize Services
@@ -44,14 +48,49 @@ metrics = get_metrics()
 # Tracer
 tracer = RequestTracer(logger, metrics)
 
-# Database
-db = Database()
+# Database, ETL pipeline and migration manager are built in lifespan and
+# kept on app.state, so importing this module (e.g. on autoreload) is cheap
 
-# ETL Pipeline
-pipeline = FinancialETLPipeline()
+# Track startup time (wall clock for display, monotonic for uptime math)
+startup_time = datetime.now(timezone.utc)
+startup_monotonic = time.monotonic()
 
-# Track startup time
-startup_time = datetime.utcnow()
+# Migration status only changes on upgrade; don't re-read it on every probe
+MIGRATION_STATUS_TTL_SECONDS = 5.0
+_migration_status_cache: Optional[tuple] = None  # (monotonic timestamp, status)
+
+
+def get_db(request: Request) -> Database:
+    """Dependency: shared Database instance."""
+    return request.app.state.db
+
+
+def get_pipeline(request: Request):
+    """Dependency: shared FinancialETLPipeline instance."""
+    return request.app.state.pipeline
+
+
+def get_migration_manager(request: Request) -> MigrationManager:
+    """Dependency: shared MigrationManager instance."""
+    return request.app.state.migration_manager
+
+
+def get_cached_migration_status(migration_manager: MigrationManager) -> Dict[str, Any]:
+    """Return migration status, re-reading it at most every few seconds."""
+    global _migration_status_cache
+    now = time.monotonic()
+    if _migration_status_cache and now - _migration_status_cache[0] < MIGRATION_STATUS_TTL_SECONDS:
+        return _migration_status_cache[1]
+    
+    status = migration_manager.get_status()
+    _migration_status_cache = (now, status)
+    return status
+
+
+def invalidate_migration_status():
+    """Drop the cached migration status (call after applying migrations)."""
+    global _migration_status_cache
+    _migration_status_cache = None
 
 
 # ============================================================================
@@ -64,9 +103,14 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("CompIQ API starting", version="2.0.0")
     
+    from etl.pipeline import FinancialETLPipeline
+    
+    db = app.state.db = Database()
+    app.state.pipeline = FinancialETLPipeline()
+    migration_manager = app.state.migration_manager = MigrationManager()
+    
     # Run migrations
     try:
-        migration_manager = MigrationManager()
         status = migration_manager.get_status()
         
         if status['pending_count'] > 0:
@@ -75,6 +119,7 @@ async def lifespan(app: FastAPI):
                 pending=status['pending_versions']
             )
             applied = migration_manager.upgrade()
+            invalidate_migration_status()
             logger.info("Migrations applied", versions=applied)
         else:
             logger.info(
@@ -101,6 +146,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("CompIQ API shutting down")
+    app.state.pipeline.close()
     
     # Log final metrics
     final_stats = metrics.get_stats()
@@ -151,9 +197,6 @@ app.add_middleware(
 @app.middleware("http")
 async def track_requests(request: Request, call_next):
     """Middleware to track all requests."""
-    import time
-    import uuid
-    
     # Generate request ID
     request_id = str(uuid.uuid4())[:8]
     
@@ -200,7 +243,16 @@ async def track_requests(request: Request, call_next):
 # Pydantic Response Models
 # ============================================================================
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+
+# Dumps a whole company list in one pass instead of model_dump() per item
+_company_list_adapter = TypeAdapter(List[CompanyInput])
+
+
+def companies_to_dicts(companies: List[CompanyInput]) -> List[Dict[str, Any]]:
+    """Convert validated request companies to plain dicts for the pipeline."""
+    return _company_list_adapter.dump_python(companies, mode="python")
+
 
 class HealthResponse(BaseModel):
     status: str
@@ -252,11 +304,14 @@ async def root():
 
 @app.get("/health", response_model=HealthResponse, tags=["General"])
 @track_metrics(metrics, "api.health")
-async def health_check():
+async def health_check(
+    db: Database = Depends(get_db),
+    migration_manager: MigrationManager = Depends(get_migration_manager)
+):
     """
     Health check endpoint for monitoring and load balancers.
     """
-    uptime = (datetime.utcnow() - startup_time).total_seconds()
+    uptime = time.monotonic() - startup_monotonic
     
     # Check database
     try:
@@ -267,8 +322,7 @@ async def health_check():
     
     # Check migrations
     try:
-        manager = MigrationManager()
-        status = manager.get_status()
+        status = get_cached_migration_status(migration_manager)
         migration_status = f"v{status['current_version']}" if status['current_version'] else "none"
         if status['pending_count'] > 0:
             migration_status += f" ({status['pending_count']} pending)"
@@ -278,7 +332,7 @@ async def health_check():
     return HealthResponse(
         status="healthy" if db_status == "connected" else "degraded",
         version="2.0.0",
-        timestamp=datetime.utcnow(),
+        timestamp=datetime.now(timezone.utc),
         database=db_status,
         migrations=migration_status,
         uptime_seconds=round(uptime, 2)
@@ -287,7 +341,7 @@ async def health_check():
 
 @app.get("/stats", response_model=StatsResponse, tags=["General"])
 @track_metrics(metrics, "api.stats")
-async def get_statistics():
+async def get_statistics(db: Database = Depends(get_db)):
     """
     Get database and API statistics.
     """
@@ -303,14 +357,17 @@ async def get_statistics():
 
 
 @app.post("/etl/validate", tags=["ETL"])
-async def validate_etl_input(request: ETLJobRequest):
+async def validate_etl_input(
+    request: ETLJobRequest,
+    pipeline=Depends(get_pipeline)
+):
     """
     Validate ETL input without running the pipeline.
     
     Use this to check data before submitting a full ETL job.
     """
     # Convert to dicts
-    companies_dict = [c.model_dump() for c in request.companies]
+    companies_dict = companies_to_dicts(request.companies)
     
     # Validate using pipeline
     is_valid, errors = pipeline.validate_input(companies_dict)
@@ -329,7 +386,10 @@ async def validate_etl_input(request: ETLJobRequest):
 
 
 @app.post("/etl/run", response_model=ETLResponse, tags=["ETL"])
-async def run_etl(request: ETLJobRequest):
+async def run_etl(
+    request: ETLJobRequest,
+    pipeline=Depends(get_pipeline)
+):
     """
     Run financial ETL pipeline.
     
@@ -343,8 +403,8 @@ async def run_etl(request: ETLJobRequest):
     )
     
     with tracer.trace("etl.run", {"companies": str(len(request.companies))}):
-        # Convert Pydantic models to dicts
-        companies_dict = [c.model_dump() for c in request.companies]
+        # Convert Pydantic models to dicts (once, reused for validate + run)
+        companies_dict = companies_to_dicts(request.companies)
         
         # Validate
         is_valid, errors = pipeline.validate_input(companies_dict)
@@ -352,8 +412,8 @@ async def run_etl(request: ETLJobRequest):
             raise HTTPException(status_code=400, detail={"errors": errors})
         
         try:
-            # Run pipeline
-            result = pipeline.run(companies_dict)
+            # Run pipeline (blocking network I/O, keep it off the event loop)
+            result = await asyncio.to_thread(pipeline.run, companies_dict)
             
             # Track metrics
             metrics.increment("etl.jobs.total")
@@ -385,21 +445,22 @@ async def run_etl(request: ETLJobRequest):
 @app.post("/etl/run/async", tags=["ETL"])
 async def run_etl_async(
     request: ETLJobRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    pipeline=Depends(get_pipeline)
 ):
     """
     Run ETL pipeline asynchronously.
     
     Returns immediately with a job ID.
     """
-    import uuid
     job_id = str(uuid.uuid4())
     
-    companies_dict = [c.model_dump() for c in request.companies]
+    companies_dict = companies_to_dicts(request.companies)
     
     # Add to background
     background_tasks.add_task(
         run_etl_background,
+        pipeline,
         job_id,
         companies_dict
     )
@@ -413,11 +474,11 @@ async def run_etl_async(
     }
 
 
-async def run_etl_background(job_id: str, companies: List[Dict]):
+async def run_etl_background(pipeline, job_id: str, companies: List[Dict]):
     """Background task for async ETL."""
     logger.info("Starting background ETL", job_id=job_id)
     try:
-        result = pipeline.run(companies)
+        result = await asyncio.to_thread(pipeline.run, companies)
         logger.info(
             "Background ETL completed",
             job_id=job_id,
@@ -431,7 +492,8 @@ async def run_etl_background(job_id: str, companies: List[Dict]):
 @track_metrics(metrics, "api.searches.list")
 async def list_searches(
     limit: int = Query(10, ge=1, le=100),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    db: Database = Depends(get_db)
 ):
     """
     List recent searches/ETL runs.
@@ -448,7 +510,7 @@ async def list_searches(
 
 @app.get("/searches/{search_id}", tags=["Searches"])
 @track_metrics(metrics, "api.searches.get")
-async def get_search(search_id: int):
+async def get_search(search_id: int, db: Database = Depends(get_db)):
     """
     Get detailed results for a specific search.
     """
@@ -461,14 +523,20 @@ async def get_search(search_id: int):
                 detail=f"Search {search_id} not found"
             )
         
-        return results
+        # Rows come straight from json.loads, so they can go to orjson as-is
+        # without the jsonable_encoder pass
+        return Response(
+            content=orjson.dumps(results, option=orjson.OPT_SERIALIZE_NUMPY),
+            media_type="application/json"
+        )
 
 
 @app.get("/companies/search", tags=["Companies"])
 @track_metrics(metrics, "api.companies.search")
 async def search_companies(
     q: str = Query(..., min_length=1),
-    limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    db: Database = Depends(get_db)
 ):
     """
     Search for companies in the database.
@@ -483,26 +551,28 @@ async def search_companies(
 
 
 @app.get("/migrations/status", tags=["Admin"])
-async def get_migration_status():
+async def get_migration_status(
+    migration_manager: MigrationManager = Depends(get_migration_manager)
+):
     """
     Get database migration status.
     """
-    manager = MigrationManager()
-    return manager.get_status()
+    return get_cached_migration_status(migration_manager)
 
 
 @app.post("/migrations/upgrade", tags=["Admin"])
-async def run_migrations():
+async def run_migrations(
+    migration_manager: MigrationManager = Depends(get_migration_manager)
+):
     """
     Apply pending database migrations.
     """
-    manager = MigrationManager()
-    
-    pending = manager.get_pending_migrations()
+    pending = migration_manager.get_pending_migrations()
     if not pending:
         return {"message": "No pending migrations", "applied": []}
     
-    applied = manager.upgrade()
+    applied = migration_manager.upgrade()
+    invalidate_migration_status()
     
     logger.info("Migrations applied via API", versions=applied)
     
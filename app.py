@@ -1,21 +1,35 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
+from html import escape
 from datetime import datetime
-import time
 import os
-from typing import Dict, Any, List
-import json
+import base64
+import copy
+import re
+import time
+from io import BytesIO
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import quote
+from urllib.request import urlopen
+from typing import Dict, Any, List, Optional, Union
+import orjson
+from importlib.util import find_spec
 
-from comps_agent import ComparablesAgent
 from database import Database, SearchHistory
 
-# Try to import v2.0 features (graceful degradation if not available)
-try:
-    from financial_data import FinancialDataEnricher
-    from visualizations import CompIQVisualizer, render_financial_summary, render_comparison_matrix
-    ENHANCED_FEATURES = True
-except ImportError:
-    ENHANCED_FEATURES = False
+# pandas/polars and the agent (openai) are imported where they are first
+# needed so the page paints before they load
+
+# Check for v2.0 features (graceful degradation if not available). Modules
+# are only located here, not imported; financial_data (yfinance) and
+# visualizations (plotly) are imported where the features are first used
+ENHANCED_FEATURES = all(
+    find_spec(name) is not None
+    for name in ("yfinance", "plotly", "financial_data", "visualizations")
+)
+if not ENHANCED_FEATURES:
     print("⚠️ Enhanced features not available. Run: pip install yfinance plotly")
 
 # Page configuration
@@ -26,8 +40,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+# Custom CSS - static markup lives at module scope so reruns only re-send it
+APP_CSS = """
 <style>
     .main-header {
         font-size: 7.5rem;
@@ -124,61 +138,547 @@ st.markdown("""
         font-weight: bold;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+# Minified once at import: the stylesheet is re-sent on every rerun (elements
+# a rerun doesn't emit are removed, so it can't be injected just once)
+APP_CSS = re.sub(r"\s*([{}:;,])\s*", r"\1", re.sub(r"\s+", " ", APP_CSS)).strip()
+
+HEADER_HTML = """
+<div style="padding-top: 10px;">
+    <h1 style="margin: 0; font-size: 2.5rem; font-weight: 700; color: #ffffff; line-height: 1.2;">CompIQ</h1>
+    <p style="margin: 0.25rem 0 0 0; font-size: 1.05rem; color: #aaa; font-weight: 400;">AI-Powered Comparable Company Analysis</p>
+</div>
+"""
+
+LOGO_FALLBACK_HTML = """
+<div style="width: 80px; height: 80px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 15px; display: flex; align-items: center; justify-content: center; font-size: 2.5rem; box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);">
+    🔍
+</div>
+"""
+
+# Static intro of the Search tab (hero, feature cards, form header) - one
+# st.html emission instead of five markdown blocks and a column layout
+SEARCH_INTRO_HTML = """
+<div style="text-align: center; padding: 2.5rem 2rem; background: linear-gradient(135deg, rgba(102, 126, 234, 0.08) 0%, rgba(118, 75, 162, 0.08) 100%); border-radius: 15px; margin-bottom: 2rem;">
+    <h1 style="font-size: 2.2rem; font-weight: 700; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text; margin-bottom: 1rem; letter-spacing: -0.02em;">
+        Find Your Perfect Comparables
+    </h1>
+    <p style="font-size: 1.1rem; color: #aaa; margin-bottom: 2rem; font-weight: 400; max-width: 600px; margin-left: auto; margin-right: auto;">
+        AI-powered company analysis • Delivered in seconds
+    </p>
+    <div style="display: flex; justify-content: center; gap: 3rem; flex-wrap: wrap; max-width: 750px; margin: 0 auto;">
+        <div style="display: flex; align-items: center; gap: 0.75rem;">
+            <div style="width: 32px; height: 32px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 50%; display: flex; align-items: center; justify-content: center;">
+                <span style="color: white; font-weight: bold; font-size: 1.1rem;">✓</span>
+            </div>
+            <span style="color: #333; font-weight: 500; font-size: 1.05rem;">100,000+ Companies</span>
+        </div>
+        <div style="display: flex; align-items: center; gap: 0.75rem;">
+            <div style="width: 32px; height: 32px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 50%; display: flex; align-items: center; justify-content: center;">
+                <span style="color: white; font-weight: bold; font-size: 1.1rem;">✓</span>
+            </div>
+            <span style="color: #333; font-weight: 500; font-size: 1.05rem;">Real-time Data</span>
+        </div>
+        <div style="display: flex; align-items: center; gap: 0.75rem;">
+            <div style="width: 32px; height: 32px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 50%; display: flex; align-items: center; justify-content: center;">
+                <span style="color: white; font-weight: bold; font-size: 1.1rem;">✓</span>
+            </div>
+            <span style="color: #333; font-weight: 500; font-size: 1.05rem;">AI Matching</span>
+        </div>
+    </div>
+</div>
+<div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 2rem;">
+    <div style="text-align: center; padding: 1.75rem 1.5rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 15px; color: white; height: 200px; display: flex; flex-direction: column; justify-content: center; box-shadow: 0 8px 20px rgba(102, 126, 234, 0.25);">
+        <div style="font-size: 2.5rem; margin-bottom: 0.75rem;">🎯</div>
+        <h3 style="margin: 0 0 0.75rem 0; color: white; font-size: 1.25rem; font-weight: 600;">Smart Analysis</h3>
+        <p style="margin: 0; font-size: 0.9rem; opacity: 0.95; line-height: 1.5;">AI understands your business model</p>
+    </div>
+    <div style="text-align: center; padding: 1.75rem 1.5rem; background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); border-radius: 15px; color: white; height: 200px; display: flex; flex-direction: column; justify-content: center; box-shadow: 0 8px 20px rgba(245, 87, 108, 0.25);">
+        <div style="font-size: 2.5rem; margin-bottom: 0.75rem;">⚡</div>
+        <h3 style="margin: 0 0 0.75rem 0; color: white; font-size: 1.25rem; font-weight: 600;">Lightning Fast</h3>
+        <p style="margin: 0; font-size: 0.9rem; opacity: 0.95; line-height: 1.5;">Results in under 30 seconds</p>
+    </div>
+    <div style="text-align: center; padding: 1.75rem 1.5rem; background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); border-radius: 15px; color: white; height: 200px; display: flex; flex-direction: column; justify-content: center; box-shadow: 0 8px 20px rgba(79, 172, 254, 0.25);">
+        <div style="font-size: 2.5rem; margin-bottom: 0.75rem;">📊</div>
+        <h3 style="margin: 0 0 0.75rem 0; color: white; font-size: 1.25rem; font-weight: 600;">Rich Insights</h3>
+        <p style="margin: 0; font-size: 0.9rem; opacity: 0.95; line-height: 1.5;">Financial data & visualizations</p>
+    </div>
+</div>
+<br><br>
+<div style="background: rgba(255,255,255,0.05); padding: 1.5rem 2rem; border-radius: 12px; border: 1px solid rgba(255,255,255,0.1); margin-bottom: 1.5rem;">
+    <h2 style="margin: 0 0 0.25rem 0; font-size: 1.5rem; color: #fff;">📝 Enter Company Details</h2>
+    <p style="margin: 0; color: #aaa; font-size: 0.9rem;">The more detail you provide, the better your results</p>
+</div>
+"""
+
+# Search form static markup: the tips box and the field labels, each label
+# carrying the spacer above it so a field takes one element, not two
+SEARCH_TIPS_HTML = """<br>
+<div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 1.25rem; border-radius: 10px; color: white; margin-top: 1rem;">
+    <div style="font-weight: 600; margin-bottom: 0.5rem; font-size: 1rem;">💡 Pro Tips</div>
+    <ul style="margin: 0; padding-left: 1.25rem; font-size: 0.9rem; line-height: 1.6;">
+        <li>Include key products/services</li>
+        <li>Mention target markets</li>
+        <li>Describe business model</li>
+    </ul>
+</div>
+"""
+REQUIRED_MARK_HTML = "<span style='color: #f5576c;'>*</span>"
+LABEL_COMPANY_NAME_HTML = f"<br><b>Company Name</b> {REQUIRED_MARK_HTML}"
+LABEL_DESCRIPTION_HTML = f"<br><b>Business Description</b> {REQUIRED_MARK_HTML}"
+LABEL_HOMEPAGE_HTML = "<br><b>Homepage URL</b>"
+LABEL_INDUSTRY_HTML = "<br><b>Primary Industry</b>"
+
+TAB_SEARCH = "🔍 New Search"
+TAB_RESULTS = "📊 Results"
+TAB_DATABASE = "📚 Database"
+TABS = [TAB_SEARCH, TAB_RESULTS, TAB_DATABASE]
+
+# Display config for the rejected-companies table
+REJECTED_COLUMNS = {
+    'Name': st.column_config.TextColumn("Name", width="medium"),
+    'Ticker': st.column_config.TextColumn("Ticker", width="small"),
+    'Status': st.column_config.TextColumn("Status", width="small"),
+    'Reason': st.column_config.TextColumn("Reason", width="large"),
+    'Acquirer': st.column_config.TextColumn("Acquirer", width="medium")
+}
+
+# Score badge classes: the tier index of a score (bisect_right against
+# SCORE_THRESHOLDS, or np.digitize for a whole result set) picks the class
+SCORE_THRESHOLDS = (3.0, 5.0)
+SCORE_CLASSES = ("score-low", "score-medium", "score-high")
+SCORE_BINS = np.array(SCORE_THRESHOLDS)
+
+# Card score badge per tier, fully formatted but for the score itself
+SCORE_BADGE_TEMPLATES = tuple(
+    f'<div class="score-badge {score_class}" style="display: block; text-align: center; padding: 0.5rem;">{{:.2f}}</div>'
+    for score_class in SCORE_CLASSES
+)
+
+st.html(APP_CSS)
+
+@st.cache_resource
+def get_db() -> Database:
+    """Shared database handle, created once per server process"""
+    return Database()
+
+# How long cached history/stats may lag writes from other processes (the
+# API, ETL runs); writes through this app's handle show up at once
+HISTORY_TTL_SECONDS = 60
+
+@st.cache_data(ttl=HISTORY_TTL_SECONDS, show_spinner=False)
+def _recent_searches(_db: Database, version: int, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Recent searches, reused across reruns. Keyed on the handle's write
+    version, so a save shows up at once; the TTL picks up other writers.
+    """
+    return _db.get_recent_searches(limit=limit)
+
+@st.cache_data(ttl=HISTORY_TTL_SECONDS, show_spinner=False)
+def _db_stats(_db: Database, version: int) -> Dict[str, int]:
+    """Database statistics, keyed on the handle's write version like _recent_searches"""
+    return _db.get_stats()
+
+@st.cache_resource(max_entries=64)
+def _search_results(_db: Database, search_id: int):
+    """
+    Saved search results (rows are never updated once written). Held as a
+    shared object rather than copied out of st.cache_data, so a rerun on an
+    unchanged search does no deserialization - callers treat it as read-only.
+    """
+    return _db.get_search_results(search_id)
+
+def load_results(search_id: int):
+    """Result set for the Results view, read through the cached DB lookup"""
+    results = _search_results(get_db(), search_id)
+    if not results:
+        return None
+    
+    target = results['target']
+    if 'name' not in target:
+        # ETL runs store a descriptor rather than a company as their target
+        target = {**target, 'name': results['metadata'].get('target', f"Search #{search_id}")}
+    
+    return {
+        'comparables': results['comparables'],
+        'metadata': results['metadata'],
+        'target': target,
+        'search_id': search_id
+    }
+
+SEARCH_CACHE_TTL_SECONDS = 86400
+
+@st.cache_resource(max_entries=8)
+def _get_agent(
+    api_key: Optional[str],
+    min_required: int,
+    max_allowed: int,
+    max_attempts: int,
+    batch_size: int,
+    max_workers: int
+):
+    """
+    Agent for one configuration, reused across searches and sessions so its
+    OpenAI client (connection pool) and public-status cache stay warm. The
+    API key is part of the key so a key entered in the sidebar takes effect.
+    """
+    from comps_agent import ComparablesAgent
+    
+    return ComparablesAgent(
+        api_key=api_key,
+        min_required=min_required,
+        max_allowed=max_allowed,
+        max_attempts=max_attempts,
+        batch_size=batch_size,
+        max_workers=max_workers
+    )
+
+@st.cache_resource
+def _get_enricher():
+    """Financial data enricher, created once per server process"""
+    from financial_data import FinancialDataEnricher
+    
+    # Result sets are capped at 20 comparables; fetch a whole set concurrently
+    return FinancialDataEnricher(max_workers=20)
+
+@st.cache_resource
+def _search_cache() -> Dict[tuple, tuple]:
+    """Finished searches shared across sessions: key -> (monotonic time, results)"""
+    return {}
+
+def _search_key(name: str, description: str, homepage_url: str, primary_sic: str) -> tuple:
+    """
+    Target part of the search cache key. Whitespace and case differences
+    don't change what the agent finds, so resubmitting a lightly edited
+    form still hits the cache.
+    """
+    return tuple(
+        " ".join(str(field or "").split()).casefold()
+        for field in (name, description, homepage_url, primary_sic)
+    )
+
+def iter_search(
+    name: str,
+    description: str,
+    homepage_url: str,
+    primary_sic: str,
+    min_required: int,
+    max_allowed: int,
+    max_attempts: int,
+    batch_size: int = 8,
+    max_workers: int = 8,
+    refresh: bool = False
+):
+    """
+    Run the comparables search, yielding (step, progress, results) as it goes.
+    
+    A finished search for the same target is replayed from cache for a
+    day unless refresh is set. Batch size and worker count only affect
+    speed, so they are left out of the cache key.
+    """
+    key = _search_key(name, description, homepage_url, primary_sic) + (min_required, max_allowed, max_attempts)
+    cache = _search_cache()
+    
+    cached = cache.get(key)
+    if cached and not refresh and time.monotonic() - cached[0] < SEARCH_CACHE_TTL_SECONDS:
+        yield "Loaded cached results", 100, copy.deepcopy(cached[1])
+        return
+    
+    agent = _get_agent(
+        os.getenv("OPENAI_API_KEY"),
+        min_required,
+        max_allowed,
+        max_attempts,
+        batch_size,
+        max_workers
+    )
+    
+    results = None
+    for step, progress, partial in agent.find_comparables_iter({
+        "name": name,
+        "description": description,
+        "homepage_url": homepage_url,
+        "primary_sic": primary_sic
+    }):
+        if partial is not None:
+            results = partial
+        yield step, progress, partial
+    
+    if results is not None:
+        now = time.monotonic()
+        for stale in [k for k, (ts, _) in cache.items() if now - ts >= SEARCH_CACHE_TTL_SECONDS]:
+            cache.pop(stale, None)
+        cache[key] = (now, copy.deepcopy(results))
+
+def get_result_key(results: Dict[str, Any]) -> str:
+    """Stable cache key for a result set - its search id once saved"""
+    if results.get('search_id') is not None:
+        return f"search:{results['search_id']}"
+    return f"{results['target'].get('name')}@{results['metadata'].get('timestamp')}"
+
+@st.cache_data(max_entries=32)
+def _summary(result_key: str, _comparables: List[Dict[str, Any]], _metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Header metrics and the analysis-insights markdown for a result set,
+    computed once per result key
+    """
+    scores = np.fromiter((c['validation_score'] for c in _comparables), dtype=float, count=len(_comparables))
+    analysis = _metadata.get('analysis') or {}
+    focus = analysis.get('core_focus_areas') or []
+    diffs = analysis.get('key_differentiators') or []
+    return {
+        'num_comparables': len(_comparables),
+        'avg_score': float(scores.mean()) if scores.size else 0.0,
+        'num_rejected': len(_metadata.get('rejected_companies', [])),
+        'specialization': analysis.get('specialization_level', 0),
+        'focus_markdown': "\n".join(["**Focus Areas:**"] + [f"- {area}" for area in focus[:5]]),
+        'model_markdown': "\n".join(
+            [f"**Business Model:** {analysis.get('business_model', 'N/A')}", "", "**Key Differentiators:**"]
+            + [f"- {diff}" for diff in diffs[:3]]
+        )
+    }
+
+def _records_frame(data: Union[List[Dict[str, Any]], Dict[str, List[Any]]]):
+    """
+    DataFrame for a table that is only displayed or serialized - polars
+    when installed (faster to build and write), pandas otherwise. Takes
+    row records or, cheaper to build, a dict of column lists.
+    """
+    try:
+        import polars as pl
+        return pl.DataFrame(data)
+    except ImportError:
+        import pandas as pd
+        return pd.DataFrame(data)
+
+def _as_text(value: Any) -> str:
+    """Render a cell as text, leaving missing values empty"""
+    return '' if value is None else str(value)
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _rejected_table(result_key: str, _rejected: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Rejected companies rows, built once per result set. Plain records - at
+    20 rows a DataFrame only adds construction and dtype inference - shared
+    read-only, so a rerun doesn't unpickle a copy.
+    """
+    rows = []
+    for r in _rejected[:20]:
+        company = r.get('company') or {}
+        rows.append({
+            'Name': company.get('name', 'Unknown'),
+            'Ticker': company.get('ticker', 'N/A'),
+            'Status': r.get('status', 'UNKNOWN'),
+            'Reason': (r.get('reason') or 'N/A')[:100],
+            'Acquirer': r.get('acquirer', 'N/A')
+        })
+    return rows
+
+@st.cache_data(max_entries=32)
+def _financials_table(result_key: str, _comparables: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Market Cap / Revenue / EV-Rev rows for the comparables that have
+    financials - one table above the cards instead of a strip per card.
+    """
+    rows = []
+    for c in _comparables:
+        fin = c.get('financials') or {}
+        if fin.get('market_cap_formatted'):
+            rows.append({
+                'Company': c['name'],
+                'Ticker': c.get('ticker', 'N/A'),
+                'Market Cap': fin['market_cap_formatted'],
+                'Revenue': fin.get('revenue_ttm_formatted') or 'N/A',
+                'EV/Rev': _as_text(fin.get('ev_to_revenue', 'N/A'))
+            })
+    return rows
+
+# Export payloads are immutable bytes: st.cache_resource hands back the
+# stored object, where st.cache_data would unpickle a copy on every rerun
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _export_frame(result_key: str, _comparables: List[Dict[str, Any]]):
+    """
+    Tabular export of a result set, shared by the CSV and Parquet payloads
+    (writers only read it). Columns are built as whole lists, so the frame
+    takes them without per-row dict inference.
+    """
+    columns = {
+        'Rank': list(range(1, len(_comparables) + 1)),
+        'Name': [c['name'] for c in _comparables],
+        'Ticker': [c['ticker'] for c in _comparables],
+        'Exchange': [c['exchange'] for c in _comparables],
+        'Score': [c['validation_score'] for c in _comparables],
+    }
+    if ENHANCED_FEATURES and _comparables[0].get('financials'):
+        fins = [c.get('financials') or {} for c in _comparables]
+        columns['Market Cap'] = [f.get('market_cap_formatted', 'N/A') for f in fins]
+        columns['Revenue'] = [f.get('revenue_ttm_formatted', 'N/A') for f in fins]
+        # Multiple or 'N/A' - kept as text so the column has one type
+        columns['EV/Revenue'] = [_as_text(f.get('ev_to_revenue', 'N/A')) for f in fins]
+        columns['Business'] = [c.get('business_activity', '') for c in _comparables]
+    else:
+        columns['Business'] = [c.get('business_activity', '') for c in _comparables]
+        columns['Customer Segment'] = [c.get('customer_segment', '') for c in _comparables]
+        columns['SIC Industry'] = [c.get('SIC_industry', '') for c in _comparables]
+    columns['URL'] = [c.get('url', '') for c in _comparables]
+    return _records_frame(columns)
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _export_csv(result_key: str, _comparables: List[Dict[str, Any]]) -> bytes:
+    """
+    CSV export payload, serialized once per result set - written straight
+    into a bytes buffer rather than built as a str and encoded after
+    """
+    df = _export_frame(result_key, _comparables)
+    buffer = BytesIO()
+    if hasattr(df, 'write_csv'):
+        df.write_csv(buffer)
+    else:
+        df.to_csv(buffer, index=False, encoding='utf-8')
+    return buffer.getvalue()
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _export_parquet(result_key: str, _comparables: List[Dict[str, Any]]) -> bytes:
+    """
+    Parquet export payload - the CSV table, typed and compressed, for
+    loading straight into pandas/polars/Arrow without a text parse.
+    """
+    df = _export_frame(result_key, _comparables)
+    buffer = BytesIO()
+    if hasattr(df, 'write_parquet'):
+        df.write_parquet(buffer)
+    else:
+        df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _export_json(result_key: str, _payload: Dict[str, Any]) -> bytes:
+    """JSON export payload, serialized once per result set"""
+    return orjson.dumps(_payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _charts(result_key: str, _comparables: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Plotly figures, metrics table, comparison-matrix HTML and peer summary
+    for a result set, built once per result key. Shared rather than
+    st.cache_data: unpickling every go.Figure on each rerun costs about as
+    much as building it, and st.plotly_chart / st.dataframe only read these
+    objects.
+    """
+    from visualizations import CompIQVisualizer, build_comparison_matrix_html
+    
+    visualizer = CompIQVisualizer()
+    return {
+        'summary': visualizer.create_valuation_summary_card(_comparables),
+        'score': visualizer.create_score_distribution(_comparables),
+        'valuation': visualizer.create_valuation_comparison(_comparables),
+        'radar': visualizer.create_radar_comparison(_comparables, top_n=5),
+        'metrics': visualizer.create_peer_metrics_table(_comparables),
+        'matrix': build_comparison_matrix_html(_comparables, top_n=5)
+    }
 
 # Initialize session state
-if 'db' not in st.session_state:
-    st.session_state.db = Database()
 if 'agent' not in st.session_state:
     st.session_state.agent = None
-if 'search_results' not in st.session_state:
-    st.session_state.search_results = None
+# Only the id of the displayed search lives in the session; the payload is
+# read back through the cached DB lookup
+if 'search_id' not in st.session_state:
+    st.session_state.search_id = None
 if 'search_history' not in st.session_state:
     st.session_state.search_history = []
+# (db version, monotonic time) the session's history was loaded at
+if 'history_loaded' not in st.session_state:
+    st.session_state.history_loaded = None
 if 'show_enhanced' not in st.session_state:
     st.session_state.show_enhanced = ENHANCED_FEATURES
 
-def load_search_history():
-    """Load recent searches from database"""
-    st.session_state.search_history = st.session_state.db.get_recent_searches(limit=10)
+def load_search_history(force: bool = False):
+    """
+    Load recent searches from database. A rerun keeps the session's copy
+    while it matches the DB version and is younger than the cache TTL,
+    skipping even the cache lookup (and its unpickle).
+    """
+    db = get_db()
+    loaded = st.session_state.history_loaded
+    if (
+        not force
+        and loaded is not None
+        and loaded[0] == db.version
+        and time.monotonic() - loaded[1] < HISTORY_TTL_SECONDS
+    ):
+        return
+    st.session_state.search_history = _recent_searches(db, db.version, limit=10)
+    st.session_state.history_loaded = (db.version, time.monotonic())
 
 def get_score_class(score: float) -> str:
     """Get CSS class for score badge"""
-    if score >= 5.0:
-        return "score-high"
-    elif score >= 3.0:
-        return "score-medium"
-    else:
-        return "score-low"
+    # A single score: bisect avoids numpy's per-call array conversion
+    return SCORE_CLASSES[bisect_right(SCORE_THRESHOLDS, score)]
 
 def get_logo_url(comp: Dict[str, Any]) -> tuple:
     """
     Get company logo URL with smart fallback.
     Returns (primary_url, fallback_url, fallback_url2)
     """
-    # Manual mapping for common companies with tricky names
-    DOMAIN_MAP = {
-        'dell technologies': 'dell.com',
-        'hewlett packard': 'hp.com',
-        'hp inc': 'hp.com',
-        'xiaomi corporation': 'xiaomi.com',
-        'acer incorporated': 'acer.com',
-        'acer inc': 'acer.com',
-        'international business machines': 'ibm.com',
-        'microsoft corporation': 'microsoft.com',
-        'apple inc': 'apple.com',
-        'alphabet inc': 'google.com',
-        'meta platforms': 'meta.com',
-        'amazon.com inc': 'amazon.com',
-    }
+    return _compute_logo_urls(
+        comp.get('homepage_url', comp.get('url', '')) or '',
+        comp.get('name', '') or '',
+        comp.get('ticker', 'N/A')
+    )
+
+# Logo domains for common companies with tricky names
+DOMAIN_MAP = {
+    'dell technologies': 'dell.com',
+    'hewlett packard': 'hp.com',
+    'hp inc': 'hp.com',
+    'xiaomi corporation': 'xiaomi.com',
+    'acer incorporated': 'acer.com',
+    'acer inc': 'acer.com',
+    'international business machines': 'ibm.com',
+    'microsoft corporation': 'microsoft.com',
+    'apple inc': 'apple.com',
+    'alphabet inc': 'google.com',
+    'meta platforms': 'meta.com',
+    'amazon.com inc': 'amazon.com',
+}
+
+LOGO_NAME_SUFFIXES = (' inc.', ' inc', ' corporation', ' corp.', ' corp', ' ltd.', ' ltd', ' llc', ' technologies', ' group', ' company')
+# One scan for all suffixes; alternatives keep the list's order, so longer
+# forms (' inc.', ' corporation') win over their prefixes as before
+LOGO_SUFFIX_RE = re.compile("|".join(re.escape(suffix) for suffix in LOGO_NAME_SUFFIXES))
+LOGO_PUNCT_RE = re.compile(r"[ ,.]")
+
+# Pure string work on small inputs: lru_cache is far cheaper per hit than
+# st.cache_data, which hashes the arguments and unpickles the result
+@lru_cache(maxsize=4096)
+def _compute_logo_urls(homepage: str, name: str, ticker: str) -> tuple:
+    """Resolve logo URLs for a company, memoized across reruns"""
+    domain = _logo_domain(homepage, name)
+    
+    # Primary: Google Favicon (always works, reliable)
+    google_url = _favicon_url(domain)
     
+    # Fallback 1: UI Avatars (generated from ticker)
+    avatar_url = f"https://ui-avatars.com/api/?name={ticker}&size=64&background=667eea&color=fff&bold=true&font-size=0.5"
+    
+    # Fallback 2: DuckDuckGo icons (another reliable service)
+    ddg_url = f"https://icons.duckduckgo.com/ip3/{domain}.ico"
+    
+    return google_url, avatar_url, ddg_url
+
+@lru_cache(maxsize=4096)
+def _logo_domain(homepage: str, name: str) -> str:
+    """
+    Domain a company's logo is looked up by. Normalized (lowercase, no www.)
+    so companies sharing a site resolve to the identical logo URL.
+    """
     # Extract domain from homepage URL
-    homepage = comp.get('homepage_url', comp.get('url', ''))
     if homepage:
         domain = homepage.replace('https://', '').replace('http://', '').split('/')[0]
+        domain = domain.lower().removeprefix('www.')
     else:
         # Try manual mapping first
-        name_lower = comp.get('name', '').lower()
+        name_lower = name.lower()
         domain = None
         
         for key, mapped_domain in DOMAIN_MAP.items():
@@ -188,131 +688,439 @@ def get_logo_url(comp: Dict[str, Any]) -> tuple:
         
         # If no mapping found, construct from company name
         if not domain:
-            name = comp.get('name', '').lower()
             # Remove common suffixes
-            for suffix in [' inc.', ' inc', ' corporation', ' corp.', ' corp', ' ltd.', ' ltd', ' llc', ' technologies', ' group', ' company']:
-                name = name.replace(suffix, '')
-            name = name.strip().replace(' ', '').replace(',', '').replace('.', '')
+            name = LOGO_SUFFIX_RE.sub('', name.lower())
+            name = LOGO_PUNCT_RE.sub('', name.strip())
             domain = f"{name}.com"
     
-    ticker = comp.get('ticker', 'N/A')
+    return domain
+
+def _favicon_url(domain: str) -> str:
+    """Google favicon URL - deterministic, so the browser cache hits across reruns"""
+    # The domain is derived from LLM output - quote it so stray spaces or
+    # control characters can't make an invalid URL
+    return f"https://www.google.com/s2/favicons?domain={quote(domain, safe='')}&sz=128"
+
+LOGO_MAX_BYTES = 32 * 1024
+LOGO_FETCH_TIMEOUT_SECONDS = 2
+LOGO_FETCH_WORKERS = 8
+# A failed fetch is retried after this long rather than never
+LOGO_RETRY_SECONDS = 300
+
+@st.cache_resource(max_entries=2048, show_spinner=False)
+def _fetch_logo_data_uri(domain: str) -> str:
+    """
+    Favicon for a domain inlined as a data: URI, fetched once per process so
+    cards need no per-logo request. Raises if the fetch fails or the payload
+    isn't a small image - exceptions are not cached, so only successes stick.
+    """
+    with urlopen(_favicon_url(domain), timeout=LOGO_FETCH_TIMEOUT_SECONDS) as response:
+        content_type = response.headers.get_content_type()
+        data = response.read(LOGO_MAX_BYTES + 1)
     
-    # Primary: Google Favicon (always works, reliable)
-    google_url = f"https://www.google.com/s2/favicons?domain={domain}&sz=128"
+    if not content_type.startswith('image/') or len(data) > LOGO_MAX_BYTES:
+        raise ValueError(f"no small image favicon for {domain!r}")
+    return f"data:{content_type};base64,{base64.b64encode(data).decode()}"
+
+@st.cache_resource
+def _logo_failures() -> Dict[str, float]:
+    """Domains whose favicon fetch failed, shared across sessions: domain -> monotonic time"""
+    return {}
+
+def _logo_data_uri(domain: str) -> Optional[str]:
+    """
+    Inlined favicon for a domain, or None (cards then show the ticker badge
+    instead). Never raises; a failure is remembered for LOGO_RETRY_SECONDS
+    so a dead domain isn't re-fetched on every build.
+    """
+    failures = _logo_failures()
+    failed_at = failures.get(domain)
+    if failed_at is not None and time.monotonic() - failed_at < LOGO_RETRY_SECONDS:
+        return None
     
-    # Fallback 1: UI Avatars (generated from ticker)
-    avatar_url = f"https://ui-avatars.com/api/?name={ticker}&size=64&background=667eea&color=fff&bold=true&font-size=0.5"
+    try:
+        data_uri = _fetch_logo_data_uri(domain)
+    except Exception:
+        # Network, HTTP (http.client.InvalidURL isn't an OSError) or payload
+        failures[domain] = time.monotonic()
+        return None
     
-    # Fallback 2: DuckDuckGo icons (another reliable service)
-    ddg_url = f"https://icons.duckduckgo.com/ip3/{domain}.ico"
+    failures.pop(domain, None)
+    return data_uri
+
+CARD_TEMPLATE = """
+<div style="display: flex; align-items: flex-start; gap: 1rem; padding: 0.75rem 0; border-bottom: 1px solid rgba(128,128,128,0.25);">
+    <div style="flex: 0 0 56px;">
+        {logo}
+    </div>
+    <div style="flex: 1;">
+        <h3 style="margin: 0 0 0.25rem 0;">{rank}. {name}</h3>
+        <div><b>{ticker}</b> • {exchange}</div>
+        <div style="margin-top: 0.25rem;">{business}...</div>
+        {details}
+    </div>
+    <div style="flex: 0 0 70px;">
+        {score_badge}
+    </div>
+</div>
+"""
+
+# Logos are inlined server-side, so whether one exists is known when the card
+# is built - no onerror handler (st.html strips those) is needed to fall back
+CARD_LOGO_TEMPLATE = """<img src="{src}" alt="" decoding="async"
+             style="width: 56px; height: 56px; border-radius: 8px; object-fit: contain; background: #f8f9fa; padding: 4px; border: 1px solid #e0e0e0;">"""
+
+CARD_BADGE_TEMPLATE = """<div style="display: flex; width: 56px; height: 56px; border-radius: 8px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); align-items: center; justify-content: center; font-size: 20px; color: white; font-weight: bold; border: 1px solid #e0e0e0;">
+            {ticker_badge}
+        </div>"""
+
+# Detail panel as a native <details> element - opening it is pure browser
+# state, so the Results tab needs no widget per card
+CARD_DETAILS_TEMPLATE = """<details style="margin-top: 0.5rem;">
+            <summary>📊 View Details</summary>
+            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; margin-top: 0.5rem;">
+                <div>{business_info}</div>
+                <div>{score_breakdown}</div>
+            </div>
+            {notes}
+        </details>"""
+
+# Collapse the templates to one line each: every card goes out in a single
+# st.html call, so indentation is pure payload
+CARD_TEMPLATE = " ".join(line.strip() for line in CARD_TEMPLATE.splitlines() if line.strip())
+CARD_LOGO_TEMPLATE = " ".join(line.strip() for line in CARD_LOGO_TEMPLATE.splitlines())
+CARD_BADGE_TEMPLATE = " ".join(line.strip() for line in CARD_BADGE_TEMPLATE.splitlines())
+CARD_DETAILS_TEMPLATE = " ".join(line.strip() for line in CARD_DETAILS_TEMPLATE.splitlines())
+
+class _HtmlFields(dict):
+    """
+    format_map context for the card templates: explicit fields first, then
+    the source dict's values HTML-escaped, then 'N/A' for anything missing.
+    """
     
-    return google_url, avatar_url, ddg_url
+    def __init__(self, source: Dict[str, Any], **fields):
+        super().__init__(fields)
+        self._source = source
+    
+    def __missing__(self, key: str) -> str:
+        value = self._source.get(key)
+        return 'N/A' if value is None else escape(str(value))
 
-def render_company_card(comp: Dict[str, Any], rank: int):
-    """Render a single comparable company card - using Streamlit native components"""
-    score = comp.get('validation_score', 0)
-    score_class = get_score_class(score)
+def build_cards_html(comparables: List[Dict[str, Any]]) -> str:
+    """Build the HTML for every company card in one pass"""
+    score = np.array([c.get('validation_score') or 0.0 for c in comparables], dtype=float)
+    tiers = np.digitize(score, SCORE_BINS)
+    
+    # Logos depend on the domain alone - resolve each distinct domain once
+    # per result set, fetching the ones not yet inlined concurrently
+    domains = [
+        _logo_domain(c.get('homepage_url', c.get('url', '')) or '', c.get('name', '') or '')
+        for c in comparables
+    ]
+    unique_domains = list(dict.fromkeys(domains))
+    logo_by_domain = {}
+    if unique_domains:
+        with ThreadPoolExecutor(max_workers=min(LOGO_FETCH_WORKERS, len(unique_domains))) as executor:
+            futures = {domain: executor.submit(_logo_data_uri, domain) for domain in unique_domains}
+            for domain, future in futures.items():
+                # A missing logo must never take down the cards (or a live search)
+                try:
+                    data_uri = future.result()
+                except Exception:
+                    data_uri = None
+                if data_uri:
+                    logo_by_domain[domain] = CARD_LOGO_TEMPLATE.format(src=escape(data_uri))
+    
+    cards = []
+    for rank, (comp, domain, comp_score, tier) in enumerate(zip(comparables, domains, score, tiers), 1):
+        cards.append(CARD_TEMPLATE.format_map(_HtmlFields(
+            comp,
+            logo=logo_by_domain.get(domain) or CARD_BADGE_TEMPLATE.format(
+                ticker_badge=escape(str(comp.get('ticker', '?'))[:2])
+            ),
+            rank=rank,
+            business=escape(str(comp.get('business_activity', 'N/A'))[:180]),
+            details=build_details_html(comp),
+            score_badge=SCORE_BADGE_TEMPLATES[tier].format(comp_score)
+        )))
+    
+    return "".join(cards)
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _cards_html(result_key: str, _comparables: List[Dict[str, Any]]) -> str:
+    """
+    Card HTML for one result set - built once, reused on every rerun. The
+    display-ready markup is the precomputed form of the cards; it is held
+    as a shared immutable str rather than st.cache_data, which would copy
+    the whole blob (inlined logos included) out of its pickle each rerun.
+    """
+    return build_cards_html(_comparables)
+
+def build_details_html(comp: Dict[str, Any]) -> str:
+    """HTML for the collapsible detail panel of one comparable"""
+    url = escape(str(comp.get('url') or '#'))
+    left = [
+        "<b>📍 Business Info:</b><ul>",
+        f"<li>Customer: {escape(str(comp.get('customer_segment', 'N/A')))}</li>",
+        f"<li>Industry: {escape(str(comp.get('SIC_industry', 'N/A')))}</li>",
+        f'<li><a href="{url}" target="_blank">Website</a></li>',
+        "</ul>",
+    ]
+    
+    # Show financial data if available
+    if ENHANCED_FEATURES and comp.get('financials'):
+        fin = comp['financials']
+        left.append("<b>💰 Financials:</b><ul>")
+        if fin.get('revenue_growth'):
+            left.append(f"<li>Revenue Growth: {fin['revenue_growth']*100:.1f}%</li>")
+        if fin.get('profit_margin'):
+            left.append(f"<li>Profit Margin: {fin['profit_margin']*100:.1f}%</li>")
+        if fin.get('employees'):
+            left.append(f"<li>Employees: {fin['employees']:,}</li>")
+        left.append("</ul>")
     
-    # Get logo URLs
-    logo_primary, logo_fallback1, logo_fallback2 = get_logo_url(comp)
+    right = ["<b>🎯 Score Breakdown:</b><ul>"] + [
+        f"<li>{escape(key.replace('_', ' ').title())}: {escape(str(value))}</li>"
+        for key, value in comp.get('score_breakdown', {}).items()
+    ] + ["</ul>"]
     
-    # Get financial data if available
-    fin = comp.get('financials', {})
+    notes = []
+    if comp.get('_caveat'):
+        notes.append(f'<div class="status-box status-analyzing">⚠️ {escape(str(comp["_caveat"]))}</div>')
+    if comp.get('_needs_verification'):
+        note = comp.get('_verification_note', 'Manual verification recommended')
+        notes.append(f'<div class="status-box status-complete">ℹ️ {escape(str(note))}</div>')
     
-    # Use a container for better styling
-    with st.container():
-        # Create columns for logo, info, and score
-        col_logo, col_info, col_score = st.columns([0.5, 4, 0.5])
+    return CARD_DETAILS_TEMPLATE.format(
+        business_info="".join(left),
+        score_breakdown="".join(right),
+        notes="".join(notes)
+    )
+
+@st.fragment
+def sidebar_history_fragment():
+    """Recent searches list - refreshing it only reruns this fragment"""
+    st.subheader("📊 Recent Searches")
+    if st.button("🔄 Refresh History"):
+        _recent_searches.clear()
+        load_search_history(force=True)
+    
+    if st.session_state.search_history:
+        # One table and one picker rather than an expander and button per search
+        recent = st.session_state.search_history[:5]
+        st.dataframe(
+            [{
+                'Target': search['target_name'][:30],
+                'Date': search['timestamp'][:10],
+                'Found': search['num_comparables']
+            } for search in recent],
+            use_container_width=True,
+            hide_index=True
+        )
+        labels = {search['id']: f"{search['target_name'][:30]} ({search['timestamp'][:10]})" for search in recent}
+        selected = st.selectbox("Load search", list(labels), format_func=labels.get)
+        if st.button("Load selected", use_container_width=True):
+            st.session_state.search_id = selected
+            # Loaded results feed every tab, so rerun the whole app
+            st.session_state.pending_tab = TAB_RESULTS
+            st.rerun()
+
+@st.fragment
+def results_fragment(result_key: str, comparables: List[Dict[str, Any]]):
+    """Financials table plus the company cards, emitted as a single HTML block"""
+    if not comparables:
+        return
+    
+    if ENHANCED_FEATURES:
+        financials = _financials_table(result_key, comparables)
+        if financials:
+            st.dataframe(financials, use_container_width=True, hide_index=True)
+    
+    st.html(_cards_html(result_key, comparables))
+
+@st.fragment
+def export_fragment(result_key: str, target: Dict[str, Any], comparables: List[Dict[str, Any]], metadata: Dict[str, Any]):
+    """Export buttons - downloads rerun only this fragment, never the search path"""
+    st.subheader("📥 Export Results")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        # CSV export
+        st.download_button(
+            "📄 Download CSV",
+            _export_csv(result_key, comparables),
+            "comparables.csv",
+            "text/csv",
+            use_container_width=True
+        )
+    
+    with col2:
+        # JSON export
+        st.download_button(
+            "📋 Download JSON",
+            _export_json(result_key, {
+                'target': target,
+                'comparables': comparables,
+                'metadata': metadata
+            }),
+            "comparables.json",
+            "application/json",
+            use_container_width=True
+        )
+    
+    with col3:
+        # Parquet export
+        st.download_button(
+            "📦 Download Parquet",
+            _export_parquet(result_key, comparables),
+            "comparables.parquet",
+            "application/vnd.apache.parquet",
+            use_container_width=True
+        )
+    
+    with col4:
+        st.button("📊 Generate Report", use_container_width=True, help="Coming soon!")
+
+@st.cache_resource
+def _logo() -> Optional[bytes]:
+    """
+    Logo image bytes, read from disk once per process (None if missing).
+    Raw PNG bytes rather than a decoded PIL image, so st.image serves them
+    as-is instead of re-encoding on every rerun.
+    """
+    try:
+        with open("compiq.png", "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def render_results_tab(enable_charts: bool):
+    """
+    Results view. Only called while the Results tab is selected, so its
+    charts and tables cost nothing while the user works in another tab.
+    """
+    st.header("Search Results")
+    
+    results = load_results(st.session_state.search_id) if st.session_state.search_id is not None else None
+    if results:
+        comparables = results['comparables']
+        metadata = results['metadata']
+        target = results['target']
+        result_key = get_result_key(results)
         
-        with col_logo:
-            # Display logo with fallback to ticker badge only if logo fails
-            logo_html = f"""
-            <img src="{logo_primary}" 
-                 onerror="this.style.display='none'; this.nextElementSibling.style.display='flex';"
-                 style="width: 56px; height: 56px; border-radius: 8px; object-fit: contain; background: #f8f9fa; padding: 4px; border: 1px solid #e0e0e0;">
-            <div style="display: none; width: 56px; height: 56px; border-radius: 8px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); align-items: center; justify-content: center; font-size: 20px; color: white; font-weight: bold; border: 1px solid #e0e0e0;">
-                {comp.get('ticker', '?')[:2]}
-            </div>
-            """
-            st.markdown(logo_html, unsafe_allow_html=True)
+        # Summary metrics
+        st.subheader(f"Target: {target['name']}")
         
-        with col_info:
-            st.markdown(f"### {rank}. {comp['name']}")
-            st.markdown(f"**{comp['ticker']}** • {comp['exchange']}")
-            st.markdown(f"{comp.get('business_activity', 'N/A')[:180]}...")
-            
-            # Add financial metrics if available
-            if ENHANCED_FEATURES and fin.get('market_cap_formatted'):
-                fin_cols = st.columns(3)
-                with fin_cols[0]:
-                    st.metric("Market Cap", fin.get('market_cap_formatted', 'N/A'))
-                with fin_cols[1]:
-                    st.metric("Revenue", fin.get('revenue_ttm_formatted', 'N/A'))
-                with fin_cols[2]:
-                    st.metric("EV/Rev", f"{fin.get('ev_to_revenue', 'N/A')}x")
+        summary = _summary(result_key, comparables, metadata)
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Comparables Found", summary['num_comparables'])
+        with col2:
+            st.metric("Avg Score", f"{summary['avg_score']:.2f}")
+        with col3:
+            st.metric("Rejected", summary['num_rejected'])
+        with col4:
+            st.metric("Specialization", f"{summary['specialization']:.2f}")
+        
+        st.divider()
         
-        with col_score:
-            score_color = "#2ca02c" if score >= 5.0 else "#ff7f0e" if score >= 3.0 else "#d62728"
-            st.markdown(f'<div style="background-color: {score_color}; color: white; padding: 0.5rem; border-radius: 1rem; text-align: center; font-weight: bold;">{score:.2f}</div>', unsafe_allow_html=True)
+        # Analysis insights
+        with st.expander("📊 Analysis Insights", expanded=True):
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(summary['focus_markdown'])
+            with col2:
+                st.markdown(summary['model_markdown'])
         
         st.divider()
-    
-    # Expandable details - more compact
-    with st.expander("📊 View Details", expanded=False):
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown("**📍 Business Info:**")
-            st.write(f"• Customer: {comp.get('customer_segment', 'N/A')}")
-            st.write(f"• Industry: {comp.get('SIC_industry', 'N/A')}")
-            st.write(f"• [Website]({comp.get('url', '#')})")
-            
-            # Show financial data if available
-            if ENHANCED_FEATURES and comp.get('financials'):
-                fin = comp['financials']
-                st.markdown("**💰 Financials:**")
-                if fin.get('revenue_growth'):
-                    st.write(f"• Revenue Growth: {fin['revenue_growth']*100:.1f}%")
-                if fin.get('profit_margin'):
-                    st.write(f"• Profit Margin: {fin['profit_margin']*100:.1f}%")
-                if fin.get('employees'):
-                    st.write(f"• Employees: {fin['employees']:,}")
         
-        with col2:
-            st.markdown("**🎯 Score Breakdown:**")
-            breakdown = comp.get('score_breakdown', {})
-            for key, value in breakdown.items():
-                display_key = key.replace('_', ' ').title()
-                st.write(f"• {display_key}: {value}")
+        # ===== v2.0 ENHANCED FEATURES =====
+        if ENHANCED_FEATURES and enable_charts:
+            try:
+                from visualizations import render_financial_summary, render_comparison_matrix
+                
+                charts = _charts(result_key, comparables)
+                
+                # Financial Summary
+                st.subheader("💰 Peer Group Valuation Metrics")
+                render_financial_summary(comparables, summary=charts['summary'])
+                
+                st.divider()
+                
+                # Visual Analysis
+                st.subheader("📊 Visual Analysis")
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.plotly_chart(charts['score'], use_container_width=True)
+                
+                with col2:
+                    val_fig = charts['valuation']
+                    if val_fig:
+                        st.plotly_chart(val_fig, use_container_width=True)
+                    else:
+                        st.info("💡 Valuation data not available for all companies")
+                
+                # Radar comparison
+                st.plotly_chart(charts['radar'], use_container_width=True)
+                
+                st.divider()
+                
+                # Comparison Matrix
+                render_comparison_matrix(comparables, top_n=5, html=charts['matrix'])
+                
+                st.divider()
+                
+                # Detailed Metrics Table
+                st.subheader("📋 Detailed Financial Metrics")
+                st.dataframe(charts['metrics'], use_container_width=True)
+                
+                st.divider()
+                
+            except Exception as e:
+                st.warning(f"Some enhanced features unavailable: {e}")
         
-        if comp.get('_caveat'):
-            st.warning(f"⚠️ {comp['_caveat']}")
-        if comp.get('_needs_verification'):
-            st.info(f"ℹ️ {comp.get('_verification_note', 'Manual verification recommended')}")
+        # Comparable companies (basic cards)
+        st.subheader("📋 Comparable Companies")
+        results_fragment(result_key, comparables)
+        
+        st.divider()
+        
+        # Rejected companies
+        rejected = metadata.get('rejected_companies', [])
+        if rejected:
+            with st.expander(f"❌ Rejected Companies ({len(rejected)})"):
+                st.dataframe(
+                    _rejected_table(result_key, rejected),
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config=REJECTED_COLUMNS
+                )
+        
+        # Export options
+        st.divider()
+        export_fragment(result_key, target, comparables, metadata)
+    
+    else:
+        st.info("👈 Run a new search to see results here")
 
 def main():
     # Professional header with CompIQ logo and white text
     col_logo, col_title = st.columns([0.8, 5])
     
     with col_logo:
-        try:
-            st.image("compiq.png", width=80)
-        except:
-            st.markdown("""
-            <div style="width: 80px; height: 80px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 15px; display: flex; align-items: center; justify-content: center; font-size: 2.5rem; box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);">
-                🔍
-            </div>
-            """, unsafe_allow_html=True)
+        logo = _logo()
+        if logo:
+            st.image(logo, width=80)
+        else:
+            st.html(LOGO_FALLBACK_HTML)
     
     with col_title:
-        st.markdown("""
-        <div style="padding-top: 10px;">
-            <h1 style="margin: 0; font-size: 2.5rem; font-weight: 700; color: #ffffff; line-height: 1.2;">CompIQ</h1>
-            <p style="margin: 0.25rem 0 0 0; font-size: 1.05rem; color: #aaa; font-weight: 400;">AI-Powered Comparable Company Analysis</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.html(HEADER_HTML)
     
     if ENHANCED_FEATURES:
-        st.markdown('<span class="v2-badge">v2.0 ENHANCED</span>', unsafe_allow_html=True)
+        st.html('<span class="v2-badge">v2.0 ENHANCED</span>')
     
     st.divider()
 
@@ -323,10 +1131,9 @@ def main():
         # Logo in sidebar - centered and larger
         col1, col2, col3 = st.columns([0.5, 3, 0.5])
         with col2:
-            try:
-                st.image("compiq.png", width=120)
-            except:
-                pass
+            logo = _logo()
+            if logo:
+                st.image(logo, width=120)
         
         st.markdown("<h3 style='text-align: center; margin-top: 10px;'>CompIQ</h3>", unsafe_allow_html=True)
         st.markdown("<p style='text-align: center; color: #666; margin-bottom: 20px;'>AI Comparables Finder</p>", unsafe_allow_html=True)
@@ -348,7 +1155,9 @@ def main():
         env_key = os.getenv("OPENAI_API_KEY", "")
         
         if api_key:
-            os.environ["OPENAI_API_KEY"] = api_key
+            # Only write the environment when the key changes, not every rerun
+            if api_key != env_key:
+                os.environ["OPENAI_API_KEY"] = api_key
             st.success("✅ API key configured")
         elif env_key:
             st.success("✅ API key loaded from environment")
@@ -363,6 +1172,14 @@ def main():
         min_required = st.slider("Minimum Comparables", 1, 10, 3)
         max_allowed = st.slider("Maximum Comparables", 5, 20, 10)
         max_attempts = st.slider("Max Search Attempts", 1, 5, 3)
+        batch_size = st.slider(
+            "LLM Batch Size", 1, 32, 8,
+            help="Candidates normalized and verified per LLM request"
+        )
+        max_workers = st.slider(
+            "Parallel Validators", 1, 32, 8,
+            help="LLM batches run concurrently during validation"
+        )
         
         # v2.0 Feature Toggle
         if ENHANCED_FEATURES:
@@ -385,108 +1202,28 @@ def main():
         st.divider()
         
         # Search History
-        st.subheader("📊 Recent Searches")
-        if st.button("🔄 Refresh History"):
-            load_search_history()
-        
-        if st.session_state.search_history:
-            for search in st.session_state.search_history[:5]:
-                with st.expander(f"{search['target_name'][:30]}..."):
-                    st.write(f"**Date:** {search['timestamp'][:10]}")
-                    st.write(f"**Found:** {search['num_comparables']} companies")
-                    if st.button(f"Load", key=f"load_{search['id']}"):
-                        results = st.session_state.db.get_search_results(search['id'])
-                        if results:
-                            st.session_state.search_results = {
-                                'comparables': results['comparables'],
-                                'metadata': results['metadata'],
-                                'target': {'name': search['target_name']}
-                            }
-                            st.rerun()
-    
-    # Main content area
-    tab1, tab2, tab3 = st.tabs(["🔍 New Search", "📊 Results", "📚 Database"])
-    
-    with tab1:
-        # Stunning hero section
-        st.markdown("""
-        <div style="text-align: center; padding: 2.5rem 2rem; background: linear-gradient(135deg, rgba(102, 126, 234, 0.08) 0%, rgba(118, 75, 162, 0.08) 100%); border-radius: 15px; margin-bottom: 2rem;">
-            <h1 style="font-size: 2.2rem; font-weight: 700; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text; margin-bottom: 1rem; letter-spacing: -0.02em;">
-                Find Your Perfect Comparables
-            </h1>
-            <p style="font-size: 1.1rem; color: #aaa; margin-bottom: 2rem; font-weight: 400; max-width: 600px; margin-left: auto; margin-right: auto;">
-                AI-powered company analysis • Delivered in seconds
-            </p>
-            <div style="display: flex; justify-content: center; gap: 3rem; flex-wrap: wrap; max-width: 750px; margin: 0 auto;">
-                <div style="display: flex; align-items: center; gap: 0.75rem;">
-                    <div style="width: 32px; height: 32px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 50%; display: flex; align-items: center; justify-content: center;">
-                        <span style="color: white; font-weight: bold; font-size: 1.1rem;">✓</span>
-                    </div>
-                    <span style="color: #333; font-weight: 500; font-size: 1.05rem;">100,000+ Companies</span>
-                </div>
-                <div style="display: flex; align-items: center; gap: 0.75rem;">
-                    <div style="width: 32px; height: 32px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 50%; display: flex; align-items: center; justify-content: center;">
-                        <span style="color: white; font-weight: bold; font-size: 1.1rem;">✓</span>
-                    </div>
-                    <span style="color: #333; font-weight: 500; font-size: 1.05rem;">Real-time Data</span>
-                </div>
-                <div style="display: flex; align-items: center; gap: 0.75rem;">
-                    <div style="width: 32px; height: 32px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 50%; display: flex; align-items: center; justify-content: center;">
-                        <span style="color: white; font-weight: bold; font-size: 1.1rem;">✓</span>
-                    </div>
-                    <span style="color: #333; font-weight: 500; font-size: 1.05rem;">AI Matching</span>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Premium feature cards
-        col1, col2, col3 = st.columns(3, gap="large")
-        
-        with col1:
-            st.markdown("""
-            <div style="text-align: center; padding: 1.75rem 1.5rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 15px; color: white; height: 200px; display: flex; flex-direction: column; justify-content: center; box-shadow: 0 8px 20px rgba(102, 126, 234, 0.25);">
-                <div style="font-size: 2.5rem; margin-bottom: 0.75rem;">🎯</div>
-                <h3 style="margin: 0 0 0.75rem 0; color: white; font-size: 1.25rem; font-weight: 600;">Smart Analysis</h3>
-                <p style="margin: 0; font-size: 0.9rem; opacity: 0.95; line-height: 1.5;">AI understands your business model</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("""
-            <div style="text-align: center; padding: 1.75rem 1.5rem; background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); border-radius: 15px; color: white; height: 200px; display: flex; flex-direction: column; justify-content: center; box-shadow: 0 8px 20px rgba(245, 87, 108, 0.25);">
-                <div style="font-size: 2.5rem; margin-bottom: 0.75rem;">⚡</div>
-                <h3 style="margin: 0 0 0.75rem 0; color: white; font-size: 1.25rem; font-weight: 600;">Lightning Fast</h3>
-                <p style="margin: 0; font-size: 0.9rem; opacity: 0.95; line-height: 1.5;">Results in under 30 seconds</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown("""
-            <div style="text-align: center; padding: 1.75rem 1.5rem; background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); border-radius: 15px; color: white; height: 200px; display: flex; flex-direction: column; justify-content: center; box-shadow: 0 8px 20px rgba(79, 172, 254, 0.25);">
-                <div style="font-size: 2.5rem; margin-bottom: 0.75rem;">📊</div>
-                <h3 style="margin: 0 0 0.75rem 0; color: white; font-size: 1.25rem; font-weight: 600;">Rich Insights</h3>
-                <p style="margin: 0; font-size: 0.9rem; opacity: 0.95; line-height: 1.5;">Financial data & visualizations</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("<br><br>", unsafe_allow_html=True)
-        
-        # Enhanced input form
-        st.markdown("""
-        <div style="background: rgba(255,255,255,0.05); padding: 1.5rem 2rem; border-radius: 12px; border: 1px solid rgba(255,255,255,0.1); margin-bottom: 1.5rem;">
-            <h2 style="margin: 0 0 0.25rem 0; font-size: 1.5rem; color: #fff;">📝 Enter Company Details</h2>
-            <p style="margin: 0; color: #aaa; font-size: 0.9rem;">The more detail you provide, the better your results</p>
-        </div>
-        """, unsafe_allow_html=True)
+        sidebar_history_fragment()
+    
+    # Main content area - a keyed radio rather than st.tabs, so code can
+    # switch views and only the active view renders
+    if 'pending_tab' in st.session_state:
+        st.session_state.active_tab = st.session_state.pop('pending_tab')
+    active_tab = st.radio(
+        "View",
+        TABS,
+        horizontal=True,
+        key='active_tab',
+        label_visibility="collapsed"
+    )
+    
+    if active_tab == TAB_SEARCH:
+        st.html(SEARCH_INTRO_HTML)
         
         with st.form("target_company_form"):
-            st.markdown("<br>", unsafe_allow_html=True)
-            
             col1, col2 = st.columns([3, 2])
             
             with col1:
-                st.markdown("**Company Name** <span style='color: #f5576c;'>*</span>", unsafe_allow_html=True)
+                st.html(LABEL_COMPANY_NAME_HTML)
                 company_name = st.text_input(
                     "Company Name",
                     placeholder="e.g., Apple Inc.",
@@ -494,8 +1231,7 @@ def main():
                     label_visibility="collapsed"
                 )
                 
-                st.markdown("<br>", unsafe_allow_html=True)
-                st.markdown("**Business Description** <span style='color: #f5576c;'>*</span>", unsafe_allow_html=True)
+                st.html(LABEL_DESCRIPTION_HTML)
                 company_description = st.text_area(
                     "Business Description",
                     height=140,
@@ -505,7 +1241,7 @@ def main():
                 )
             
             with col2:
-                st.markdown("**Homepage URL**", unsafe_allow_html=True)
+                st.html(LABEL_HOMEPAGE_HTML)
                 homepage_url = st.text_input(
                     "Homepage URL",
                     placeholder="https://www.apple.com",
@@ -513,8 +1249,7 @@ def main():
                     label_visibility="collapsed"
                 )
                 
-                st.markdown("<br>", unsafe_allow_html=True)
-                st.markdown("**Primary Industry**", unsafe_allow_html=True)
+                st.html(LABEL_INDUSTRY_HTML)
                 primary_sic = st.text_input(
                     "Primary SIC",
                     placeholder="e.g., Consumer Electronics",
@@ -522,21 +1257,10 @@ def main():
                     label_visibility="collapsed"
                 )
                 
-                st.markdown("<br>", unsafe_allow_html=True)
-                
                 # Tips box
-                st.markdown("""
-                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 1.25rem; border-radius: 10px; color: white; margin-top: 1rem;">
-                    <div style="font-weight: 600; margin-bottom: 0.5rem; font-size: 1rem;">💡 Pro Tips</div>
-                    <ul style="margin: 0; padding-left: 1.25rem; font-size: 0.9rem; line-height: 1.6;">
-                        <li>Include key products/services</li>
-                        <li>Mention target markets</li>
-                        <li>Describe business model</li>
-                    </ul>
-                </div>
-                """, unsafe_allow_html=True)
+                st.html(SEARCH_TIPS_HTML)
             
-            st.markdown("<br>", unsafe_allow_html=True)
+            st.html("<br>")
             
             # Submit button
             col1, col2, col3 = st.columns([1, 2, 1])
@@ -546,9 +1270,12 @@ def main():
                     use_container_width=True,
                     type="primary"
                 )
+                force_refresh = st.checkbox(
+                    "Force refresh",
+                    help="Ignore cached results for a previously searched company"
+                )
         
-        st.markdown("</div>", unsafe_allow_html=True)
-        st.markdown("<br><br>", unsafe_allow_html=True)
+        st.html("<br><br>")
         
         # Enhanced expandable sections
         col1, col2 = st.columns(2)
@@ -605,55 +1332,69 @@ def main():
                 
                 # Progress tracking
                 progress_bar = st.progress(0)
-                status_container = st.container()
+                status_container = st.empty()
+                status_container.markdown('<div class="status-box status-analyzing">⏳ Analyzing target company...</div>', unsafe_allow_html=True)
+                # Best comparables found so far, replaced as the search improves them
+                preview_container = st.empty()
                 
-                with status_container:
-                    st.markdown('<div class="status-box status-analyzing">⏳ Analyzing target company...</div>', unsafe_allow_html=True)
                 try:
-                    # Initialize agent
-                    agent = ComparablesAgent(
-                        min_required=min_required,
-                        max_allowed=max_allowed,
-                        max_attempts=max_attempts
-                    )
-                    
-                    # Run search with progress updates
-                    progress_bar.progress(10)
-                    status_container.markdown('<div class="status-box status-analyzing">🧠 Analyzing target company...</div>', unsafe_allow_html=True)
+                    # Run search, updating progress and partial results in place
+                    results = None
+                    for step, progress, partial in iter_search(
+                        target["name"],
+                        target["description"],
+                        target["homepage_url"],
+                        target["primary_sic"],
+                        min_required,
+                        max_allowed,
+                        max_attempts,
+                        batch_size=batch_size,
+                        max_workers=max_workers,
+                        refresh=force_refresh
+                    ):
+                        progress_bar.progress(progress)
+                        status_container.markdown(f'<div class="status-box status-analyzing">🧠 {escape(step)}...</div>', unsafe_allow_html=True)
+                        if partial is not None:
+                            results = partial
+                            if partial.get('comparables'):
+                                preview_container.html(build_cards_html(partial['comparables']))
                     
-                    results = agent.find_comparables(target)
+                    # The full Results view takes over from the preview
+                    preview_container.empty()
                     
                     # Ensure target is included in results
                     if 'target' not in results:
                         results['target'] = target
                     
                     progress_bar.progress(100)
-                    status_container.markdown('<div class="status-box status-complete">✅ Search complete!</div>', unsafe_allow_html=True)
                     
                     # Enrich with financial data if enabled
                     if ENHANCED_FEATURES and enable_financials and results['comparables']:
                         status_container.markdown('<div class="status-box status-analyzing">💰 Fetching financial data...</div>', unsafe_allow_html=True)
-                        enricher = FinancialDataEnricher()
+                        enricher = _get_enricher()
                         enriched = enricher.enrich_batch(results['comparables'], show_progress=False)
                         results['comparables'] = enriched
                     
-                    # Store results
-                    st.session_state.search_results = results
-                    
-                    # Save to database
-                    st.session_state.db.save_search(
-                        target_name=company_name,
-                        target_data=target,
-                        comparables=results['comparables'],
-                        metadata=results['metadata']
-                    )
+                    # Save to database - one transaction for the whole result set
+                    with st.spinner("Saving..."):
+                        st.session_state.search_id = get_db().save_search(
+                            target_name=company_name,
+                            target_data=target,
+                            comparables=results['comparables'],
+                            metadata=results['metadata']
+                        )
                     
-                    # Reload history
+                    # Reload history - the save bumped the DB version
                     load_search_history()
                     
-                    # Switch to results tab
-                    time.sleep(1)
-                    st.success("✅ Search complete! View results in the Results tab.")
+                    # Draw the results below the form on this same run; the
+                    # radio itself moves to Results on the next rerun
+                    st.session_state.pending_tab = TAB_RESULTS
+                    active_tab = TAB_RESULTS
+                    # One completion notice: the status box, plus a toast that
+                    # stays visible while the results render below
+                    status_container.markdown('<div class="status-box status-complete">✅ Search complete!</div>', unsafe_allow_html=True)
+                    st.toast("✅ Search complete!")
                     
                 except Exception as e:
                     st.error(f"❌ Error during search: {str(e)}")
@@ -664,186 +1405,16 @@ def main():
                     progress_bar.empty()
         
 
-        with tab2:
-            st.header("Search Results")
-        
-        if st.session_state.search_results:
-            results = st.session_state.search_results
-            comparables = results['comparables']
-            metadata = results['metadata']
-            target = results['target']
-            
-            # Summary metrics
-            st.subheader(f"Target: {target['name']}")
-            
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("Comparables Found", len(comparables))
-            with col2:
-                avg_score = sum(c['validation_score'] for c in comparables) / len(comparables) if comparables else 0
-                st.metric("Avg Score", f"{avg_score:.2f}")
-            with col3:
-                num_rejected = len(metadata.get('rejected_companies', []))
-                st.metric("Rejected", num_rejected)
-            with col4:
-                specialization = metadata.get('analysis', {}).get('specialization_level', 0)
-                st.metric("Specialization", f"{specialization:.2f}")
-            
-            st.divider()
-            
-            # Analysis insights
-            with st.expander("📊 Analysis Insights", expanded=True):
-                analysis = metadata.get('analysis', {})
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.write("**Focus Areas:**")
-                    for area in analysis.get('core_focus_areas', [])[:5]:
-                        st.write(f"- {area}")
-                with col2:
-                    st.write("**Business Model:**", analysis.get('business_model', 'N/A'))
-                    st.write("**Key Differentiators:**")
-                    for diff in analysis.get('key_differentiators', [])[:3]:
-                        st.write(f"- {diff}")
-            
-            st.divider()
-            
-            # ===== v2.0 ENHANCED FEATURES =====
-            if ENHANCED_FEATURES and enable_charts:
-                try:
-                    # Financial Summary
-                    st.subheader("💰 Peer Group Valuation Metrics")
-                    render_financial_summary(comparables)
-                    
-                    st.divider()
-                    
-                    # Visual Analysis
-                    st.subheader("📊 Visual Analysis")
-                    visualizer = CompIQVisualizer()
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        score_fig = visualizer.create_score_distribution(comparables)
-                        st.plotly_chart(score_fig, use_container_width=True)
-                    
-                    with col2:
-                        val_fig = visualizer.create_valuation_comparison(comparables)
-                        if val_fig:
-                            st.plotly_chart(val_fig, use_container_width=True)
-                        else:
-                            st.info("💡 Valuation data not available for all companies")
-                    
-                    # Radar comparison
-                    radar_fig = visualizer.create_radar_comparison(comparables, top_n=5)
-                    st.plotly_chart(radar_fig, use_container_width=True)
-                    
-                    st.divider()
-                    
-                    # Comparison Matrix
-                    render_comparison_matrix(comparables, top_n=5)
-                    
-                    st.divider()
-                    
-                    # Detailed Metrics Table
-                    st.subheader("📋 Detailed Financial Metrics")
-                    metrics_df = visualizer.create_peer_metrics_table(comparables)
-                    st.dataframe(metrics_df, use_container_width=True)
-                    
-                    st.divider()
-                    
-                except Exception as e:
-                    st.warning(f"Some enhanced features unavailable: {e}")
-            
-            # Comparable companies (basic cards)
-            st.subheader("📋 Comparable Companies")
-            
-            for i, comp in enumerate(comparables, 1):
-                render_company_card(comp, i)
-            
-            st.divider()
-            
-            # Rejected companies
-            rejected = metadata.get('rejected_companies', [])
-            if rejected:
-                with st.expander(f"❌ Rejected Companies ({len(rejected)})"):
-                    rejected_df = pd.DataFrame([{
-                        'Name': r.get('company', {}).get('name', 'Unknown'),
-                        'Ticker': r.get('company', {}).get('ticker', 'N/A'),
-                        'Status': r.get('status', 'UNKNOWN'),
-                        'Reason': r.get('reason', 'N/A')[:100],
-                        'Acquirer': r.get('acquirer', 'N/A')
-                    } for r in rejected[:20]])
-                    st.dataframe(rejected_df, use_container_width=True)
-            
-            # Export options
-            st.divider()
-            st.subheader("📥 Export Results")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                # CSV export
-                if ENHANCED_FEATURES and comparables[0].get('financials'):
-                    csv_data = pd.DataFrame([{
-                        'Rank': i+1,
-                        'Name': c['name'],
-                        'Ticker': c['ticker'],
-                        'Exchange': c['exchange'],
-                        'Score': c['validation_score'],
-                        'Market Cap': c.get('financials', {}).get('market_cap_formatted', 'N/A'),
-                        'Revenue': c.get('financials', {}).get('revenue_ttm_formatted', 'N/A'),
-                        'EV/Revenue': c.get('financials', {}).get('ev_to_revenue', 'N/A'),
-                        'Business': c.get('business_activity', ''),
-                        'URL': c.get('url', '')
-                    } for i, c in enumerate(comparables)])
-                else:
-                    csv_data = pd.DataFrame([{
-                        'Rank': i+1,
-                        'Name': c['name'],
-                        'Ticker': c['ticker'],
-                        'Exchange': c['exchange'],
-                        'Score': c['validation_score'],
-                        'Business': c.get('business_activity', ''),
-                        'Customer Segment': c.get('customer_segment', ''),
-                        'SIC Industry': c.get('SIC_industry', ''),
-                        'URL': c.get('url', '')
-                    } for i, c in enumerate(comparables)])
-                
-                st.download_button(
-                    "📄 Download CSV",
-                    csv_data.to_csv(index=False),
-                    "comparables.csv",
-                    "text/csv",
-                    use_container_width=True
-                )
-            
-            with col2:
-                # JSON export
-                json_data = json.dumps({
-                    'target': target,
-                    'comparables': comparables,
-                    'metadata': metadata
-                }, indent=2)
-                
-                st.download_button(
-                    "📋 Download JSON",
-                    json_data,
-                    "comparables.json",
-                    "application/json",
-                    use_container_width=True
-                )
-            
-            with col3:
-                st.button("📊 Generate Report", use_container_width=True, help="Coming soon!")
-        
-        else:
-            st.info("👈 Run a new search to see results here")
+    if active_tab == TAB_RESULTS:
+        render_results_tab(enable_charts)
     
-    with tab3:
+    if active_tab == TAB_DATABASE:
         st.header("Company Database")
         st.info("🚧 Database exploration features coming soon!")
         
         # Show stats
-        stats = st.session_state.db.get_stats()
+        db = get_db()
+        stats = _db_stats(db, db.version)
         
         col1, col2 = st.columns(2)
         with col1:
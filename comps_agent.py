@@ -1,14 +1,19 @@
 """
 Refactored Comparables Agent with progress tracking and better modularity.
 """
-from typing import List, Dict, Any, Optional, Tuple, Callable
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
+import threading
 import time
 import os
+import re
 import logging
 import numpy as np
 from openai import OpenAI
-import json
+import orjson
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -18,6 +23,59 @@ TargetCompany = Dict[str, str]
 ComparableCompany = Dict[str, Any]
 ProgressCallback = Callable[[str, int], None]
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+
+# Markdown code fence around an LLM reply (closing fence optional, since
+# replies are sometimes truncated)
+_JSON_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*(?:```)?$", re.DOTALL | re.IGNORECASE)
+_JSON_CLOSERS = {"[": "]", "{": "}"}
+
+
+def _extract_json(text: str) -> Any:
+    """
+    Parse JSON from an LLM reply: the text as-is, else the fenced body,
+    else the outermost array/object - trying whichever opens first, then
+    the other. Returns None if nothing parses.
+    """
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        pass
+    
+    text_clean = text.strip()
+    match = _JSON_FENCE_RE.match(text_clean)
+    if match:
+        text_clean = match.group(1)
+        try:
+            return orjson.loads(text_clean)
+        except orjson.JSONDecodeError:
+            pass
+    
+    starts = sorted(
+        (start, opener) for opener in _JSON_CLOSERS
+        if (start := text_clean.find(opener)) != -1
+    )
+    for start, opener in starts:
+        end = text_clean.rfind(_JSON_CLOSERS[opener])
+        if end > start:
+            try:
+                return orjson.loads(text_clean[start:end + 1])
+            except orjson.JSONDecodeError:
+                pass
+    
+    return None
+
+
+@lru_cache(maxsize=8)
+def _openai_client(api_key: str) -> OpenAI:
+    """
+    OpenAI client per API key, shared by every agent built with that key.
+    Clients are thread-safe and hold the HTTP connection pool, so agents
+    rebuilt for new settings keep warm connections.
+    """
+    return OpenAI(api_key=api_key)
+
 
 class ComparablesAgent:
     """
@@ -30,17 +88,23 @@ class ComparablesAgent:
         api_key: Optional[str] = None,
         min_required: int = 3,
         max_allowed: int = 10,
-        max_attempts: int = 3
+        max_attempts: int = 3,
+        batch_size: int = 8,
+        max_workers: int = 8
     ):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key required")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = _openai_client(self.api_key)
         self.min_required = min_required
         self.max_allowed = max_allowed
         self.max_attempts = max_attempts
-        self.validator = PublicStatusValidator(self.client)
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max(1, max_workers)
+        self.validator = PublicStatusValidator(
+            self.client, batch_size=self.batch_size, max_workers=self.max_workers
+        )
     
     def find_comparables(
         self,
@@ -57,10 +121,29 @@ class ComparablesAgent:
         Returns:
             Dict with 'comparables' and 'metadata' keys
         """
-        def update_progress(step: str, progress: int):
+        results = None
+        for step, progress, partial in self.find_comparables_iter(target):
             if progress_callback:
                 progress_callback(step, progress)
+            if partial is not None:
+                results = partial
+        return results
+    
+    def find_comparables_iter(
+        self,
+        target: TargetCompany
+    ) -> Iterator[Tuple[str, int, Optional[Dict[str, Any]]]]:
+        """
+        Find comparable companies, yielding progress as the search runs.
+        
+        Yields:
+            (step, progress percent, results or None). Results are yielded
+            whenever the best set found so far improves; the final yield
+            always carries the complete 'comparables'/'metadata' dict.
+        """
+        def update_progress(step: str, progress: int, partial: Optional[Dict[str, Any]] = None):
             logger.info(f"{step} ({progress}%)")
+            return step, progress, partial
         
         metadata = {
             "target": target["name"],
@@ -68,18 +151,20 @@ class ComparablesAgent:
             "rejected_companies": [],
             "validation_method": "dynamic_llm"
         }
+        # Per-run tally kept local: one agent may serve concurrent searches
+        dedup_cache_hits = 0
         
         # Step 1: Analyze target (10-20%)
-        update_progress("Analyzing target company", 10)
+        yield update_progress("Analyzing target company", 10)
         analysis = self._analyze_target(target)
         metadata["analysis"] = analysis
-        update_progress("Analysis complete", 20)
+        yield update_progress("Analysis complete", 20)
         
         # Step 2: Create embeddings (20-30%)
-        update_progress("Creating semantic embeddings", 25)
+        yield update_progress("Creating semantic embeddings", 25)
         target_norm = self._normalize_description(target["description"], analysis)
         target_embedding = self._embed_texts([target_norm])[0]
-        update_progress("Embeddings created", 30)
+        yield update_progress("Embeddings created", 30)
         
         # Step 3: Generate and validate candidates (30-90%)
         best_comps, best_rejected = [], []
@@ -90,7 +175,7 @@ class ComparablesAgent:
             progress_start = 30 + (attempt - 1) * 20
             progress_end = progress_start + 20
             
-            update_progress(f"Generating candidates (attempt {attempt}/{self.max_attempts})", progress_start)
+            yield update_progress(f"Generating candidates (attempt {attempt}/{self.max_attempts})", progress_start)
             
             candidates = self._generate_candidates(
                 target, analysis, 25, attempt, use_broader
@@ -99,35 +184,42 @@ class ComparablesAgent:
             if not candidates:
                 continue
             
-            update_progress(f"Validating {len(candidates)} candidates", progress_start + 5)
+            yield update_progress(f"Validating {len(candidates)} candidates", progress_start + 5)
             
-            comps, rejected = self._validate_and_rank(
+            comps, rejected, cache_hits = self._validate_and_rank(
                 candidates,
                 analysis,
                 target_embedding,
                 target["description"]
             )
+            dedup_cache_hits += cache_hits
             
-            update_progress(f"Found {len(comps)} valid comparables", progress_end)
+            metadata["dedup_cache_hits"] = dedup_cache_hits
             
             if len(comps) >= self.min_required:
                 metadata["rejected_companies"] = rejected
-                update_progress("Search complete", 100)
-                return {
+                yield update_progress("Search complete", 100, {
                     "comparables": comps,
                     "metadata": metadata
-                }
+                })
+                return
             
             if len(comps) > len(best_comps):
                 best_comps, best_rejected = comps, rejected
+                yield update_progress(f"Found {len(comps)} valid comparables", progress_end, {
+                    "comparables": best_comps,
+                    "metadata": {**metadata, "rejected_companies": best_rejected}
+                })
+            else:
+                yield update_progress(f"Found {len(comps)} valid comparables", progress_end)
         
         # Return best effort
         metadata["rejected_companies"] = best_rejected
-        update_progress("Search complete (partial results)", 100)
-        return {
+        metadata["dedup_cache_hits"] = dedup_cache_hits
+        yield update_progress("Search complete (partial results)", 100, {
             "comparables": best_comps,
             "metadata": metadata
-        }
+        })
     
     def _analyze_target(self, target: TargetCompany) -> Dict[str, Any]:
         """Analyze target company to extract key characteristics."""
@@ -275,28 +367,53 @@ Return JSON array:
         analysis: Dict[str, Any],
         target_embedding: np.ndarray,
         target_description: str
-    ) -> Tuple[List[ComparableCompany], List[Dict[str, Any]]]:
-        """Validate and rank candidate companies."""
+    ) -> Tuple[List[ComparableCompany], List[Dict[str, Any]], int]:
+        """
+        Validate and rank candidate companies.
+        
+        Returns (ranked, rejected, cache_hits), where cache_hits counts
+        candidates skipped as duplicates or served from the public-status cache.
+        """
         all_rejected = []
+        cache_hits = 0
         
-        # Basic validation
-        valid_candidates = [
-            c for c in candidates
-            if self._is_valid_company_data(c)
-        ]
+        # Basic validation, keeping the first candidate seen for each ticker
+        valid_candidates = []
+        seen_tickers = set()
+        for c in candidates:
+            if not self._is_valid_company_data(c):
+                continue
+            ticker_key = (c["ticker"].strip().upper(), c["exchange"].strip().upper())
+            if ticker_key in seen_tickers:
+                cache_hits += 1
+                continue
+            seen_tickers.add(ticker_key)
+            valid_candidates.append(c)
         
         # Public status validation
+        cache_hits += sum(1 for c in valid_candidates if self.validator.is_cached(c))
         public_valid, public_rejected = self.validator.validate_companies(valid_candidates)
         all_rejected.extend(public_rejected)
         
-        # Normalize descriptions and score
-        for comp in public_valid:
-            if "normalized_description" not in comp:
-                text = f"{comp.get('business_activity', '')} {comp.get('customer_segment', '')}"
-                comp["normalized_description"] = self._normalize_description(text, analysis)
-            
+        # Normalize descriptions several candidates per prompt
+        to_normalize = [c for c in public_valid if "normalized_description" not in c]
+        normalized = self._normalize_descriptions_batch(
+            [f"{c.get('business_activity', '')} {c.get('customer_segment', '')}" for c in to_normalize],
+            analysis
+        )
+        for comp, text in zip(to_normalize, normalized):
+            comp["normalized_description"] = text
+        
+        # Embed every candidate in one request, then score
+        # An empty normalization falls back to the raw business activity
+        comp_embeddings = self._embed_texts([
+            c.get("normalized_description") or c.get("business_activity", "")
+            for c in public_valid
+        ]) if public_valid else []
+        
+        for comp, comp_embedding in zip(public_valid, comp_embeddings):
             result = self._score_comparable(
-                comp, analysis, target_embedding, target_description
+                comp, analysis, target_embedding, target_description, comp_embedding
             )
             comp["validation_score"] = result["score"]
             comp["score_breakdown"] = result["breakdown"]
@@ -309,9 +426,9 @@ Return JSON array:
         for t in thresholds:
             filtered = [c for c in scored if c["validation_score"] >= t]
             if len(filtered) >= self.min_required:
-                return filtered[:self.max_allowed], all_rejected
+                return filtered[:self.max_allowed], all_rejected, cache_hits
         
-        return scored[:self.max_allowed], all_rejected
+        return scored[:self.max_allowed], all_rejected, cache_hits
     
     def _normalize_description(self, description: str, analysis: Dict[str, Any]) -> str:
         """Normalize description for comparison."""
@@ -335,22 +452,104 @@ Return ONE paragraph (3-5 sentences).
             logger.error(f"Error normalizing: {e}")
             return description
     
+    def _normalize_descriptions_batch(
+        self,
+        descriptions: List[str],
+        analysis: Dict[str, Any]
+    ) -> List[str]:
+        """
+        Normalize many descriptions with one prompt per batch_size items.
+        
+        Batches are independent, so they run concurrently on up to
+        max_workers threads.
+        """
+        batches = [
+            descriptions[i:i + self.batch_size]
+            for i in range(0, len(descriptions), self.batch_size)
+        ]
+        if not batches:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            normalized = executor.map(lambda b: self._normalize_chunk(b, analysis), batches)
+            return [text for batch in normalized for text in batch]
+    
+    def _normalize_chunk(
+        self,
+        batch: List[str],
+        analysis: Dict[str, Any]
+    ) -> List[str]:
+        """
+        Normalize one batch, halving it when the prompt overflows the
+        model's context window. A batch whose response can't be matched back
+        to its inputs falls back to one prompt per description.
+        """
+        if len(batch) == 1:
+            return [self._normalize_description(batch[0], analysis)]
+        
+        try:
+            return self._normalize_batch_prompt(batch, analysis)
+        except Exception as e:
+            if getattr(e, "code", None) == "context_length_exceeded":
+                half = len(batch) // 2
+                logger.warning(f"Normalization batch too large, splitting into {half} + {len(batch) - half}")
+                return self._normalize_chunk(batch[:half], analysis) + self._normalize_chunk(batch[half:], analysis)
+            logger.error(f"Error normalizing batch: {e}")
+            return [self._normalize_description(d, analysis) for d in batch]
+    
+    def _normalize_batch_prompt(
+        self,
+        batch: List[str],
+        analysis: Dict[str, Any]
+    ) -> List[str]:
+        """Normalize a batch of descriptions in a single LLM call."""
+        focus = ", ".join(analysis.get("core_focus_areas", [])[:5])
+        numbered = "\n".join(f"[{j + 1}] {d}" for j, d in enumerate(batch))
+        
+        prompt = f"""
+Rewrite each description into a factual comparable profile focusing on PRIMARY revenue activities.
+Context: {focus}
+
+Descriptions:
+{numbered}
+
+Return ONLY a JSON array of {len(batch)} strings, one paragraph (3-5 sentences) each, in the same order.
+"""
+        
+        resp = self.client.chat.completions.create(
+            model="gpt-4o",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.1
+        )
+        
+        parsed = self._safe_parse_json(resp.choices[0].message.content)
+        if (
+            not isinstance(parsed, list)
+            or len(parsed) != len(batch)
+            or not all(isinstance(p, str) and p.strip() for p in parsed)
+        ):
+            raise ValueError(f"Expected {len(batch)} normalized descriptions")
+        
+        return [p.strip() for p in parsed]
+    
     def _score_comparable(
         self,
         comp: ComparableCompany,
         analysis: Dict[str, Any],
         target_embedding: np.ndarray,
-        target_description: str
+        target_description: str,
+        comp_embedding: Optional[np.ndarray] = None
     ) -> Dict[str, Any]:
         """Score how well a comparable matches the target."""
         score = 1.0
         breakdown = {"valid_public_operating": 1.0}
         
-        comp_normalized = comp.get("normalized_description", comp.get("business_activity", ""))
+        comp_normalized = comp.get("normalized_description") or comp.get("business_activity", "")
         
         # Semantic similarity
         try:
-            comp_embedding = self._embed_texts([comp_normalized])[0]
+            if comp_embedding is None:
+                comp_embedding = self._embed_texts([comp_normalized])[0]
             semantic_sim = self._cosine_similarity(target_embedding, comp_embedding)
             specialization = analysis.get("specialization_level", 0.5)
             weight = 3.0 + (specialization * 2.0)
@@ -381,16 +580,42 @@ Return ONE paragraph (3-5 sentences).
         return {"score": round(score, 3), "breakdown": breakdown}
     
     def _embed_texts(self, texts: List[str]) -> np.ndarray:
-        """Generate embeddings."""
+        """
+        Generate embeddings, one row per text. Blank texts (which the API
+        rejects) get zero vectors without being sent. If the batched call
+        fails, texts are embedded one by one so a bad input only zeroes
+        its own row.
+        """
+        embeddings = np.zeros((len(texts), EMBEDDING_DIM))
+        idx = [i for i, text in enumerate(texts) if isinstance(text, str) and text.strip()]
+        if not idx:
+            return embeddings
+        
         try:
             resp = self.client.embeddings.create(
-                model="text-embedding-3-small",
-                input=texts
+                model=EMBEDDING_MODEL,
+                input=[texts[i] for i in idx]
             )
-            return np.array([d.embedding for d in resp.data])
+            embeddings[idx] = [d.embedding for d in resp.data]
+            return embeddings
         except Exception as e:
             logger.error(f"Error generating embeddings: {e}")
-            return np.zeros((len(texts), 1536))
+        
+        if len(idx) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(idx))) as executor:
+                for i, embedding in zip(idx, executor.map(self._embed_one, [texts[i] for i in idx])):
+                    if embedding is not None:
+                        embeddings[i] = embedding
+        return embeddings
+    
+    def _embed_one(self, text: str) -> Optional[List[float]]:
+        """Embedding for a single text, None if the call fails."""
+        try:
+            resp = self.client.embeddings.create(model=EMBEDDING_MODEL, input=[text])
+            return resp.data[0].embedding
+        except Exception as e:
+            logger.error(f"Error generating embedding: {e}")
+            return None
     
     @staticmethod
     def _cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
@@ -411,46 +636,59 @@ Return ONE paragraph (3-5 sentences).
     @staticmethod
     def _safe_parse_json(text: str) -> Any:
         """Parse JSON from LLM response."""
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            pass
-        
-        text_clean = text.strip()
-        
-        # Remove markdown
-        if text_clean.startswith("```"):
-            lines = text_clean.split("\n")
-            text_clean = "\n".join(lines[1:-1] if lines[-1].strip() == "```" else lines[1:])
-        
-        # Extract array
-        start = text_clean.find("[")
-        end = text_clean.rfind("]")
-        if start != -1 and end != -1 and end > start:
-            try:
-                return json.loads(text_clean[start:end + 1])
-            except json.JSONDecodeError:
-                pass
-        
-        # Extract object
-        start = text_clean.find("{")
-        end = text_clean.rfind("}")
-        if start != -1 and end != -1 and end > start:
-            try:
-                return json.loads(text_clean[start:end + 1])
-            except json.JSONDecodeError:
-                pass
-        
-        logger.warning(f"Could not parse JSON from response")
-        return [] if "[" in text else {}
+        parsed = _extract_json(text)
+        if parsed is None:
+            logger.warning(f"Could not parse JSON from response")
+            return [] if "[" in text else {}
+        return parsed
 
 
 class PublicStatusValidator:
     """Validates whether companies are currently publicly traded."""
     
-    def __init__(self, client: OpenAI):
+    # Verifications kept (least recently used evicted first) and how long one
+    # is trusted before the company's listing status is checked again
+    CACHE_MAX_SIZE = 4096
+    CACHE_TTL_SECONDS = 24 * 3600
+    
+    def __init__(self, client: OpenAI, batch_size: int = 5, max_workers: int = 8):
         self.client = client
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        # Public status doesn't depend on the target, so verifications are
+        # reused across attempts and searches: key -> (monotonic time,
+        # verification). Agents are shared across sessions, hence the lock.
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    @staticmethod
+    def _cache_key(company: ComparableCompany) -> Tuple[str, str]:
+        """Cache key for a company: (TICKER, EXCHANGE)."""
+        return (company.get("ticker", "").strip().upper(), company.get("exchange", "").strip().upper())
+    
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """Cached verification for a key, None if missing or expired."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self.CACHE_TTL_SECONDS:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry[1]
+    
+    def _cache_put(self, key: Tuple[str, str], verification: Dict[str, Any]):
+        """Store a verification, evicting the least recently used past the size cap."""
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), verification)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.CACHE_MAX_SIZE:
+                self._cache.popitem(last=False)
+    
+    def is_cached(self, company: ComparableCompany) -> bool:
+        """Whether the company's public status is already known."""
+        return self._cache_get(self._cache_key(company)) is not None
     
     def validate_companies(
         self,
@@ -460,9 +698,19 @@ class PublicStatusValidator:
         if not companies:
             return [], []
         
-        logger.info(f"Verifying public status for {len(companies)} companies...")
+        keys = [self._cache_key(c) for c in companies]
+        verifications = [self._cache_get(key) for key in keys]
+        miss_idx = [i for i, verification in enumerate(verifications) if verification is None]
         
-        verifications = self._verify_batch(companies)
+        logger.info(f"Verifying public status for {len(miss_idx)} companies ({len(companies) - len(miss_idx)} cached)...")
+        
+        if miss_idx:
+            fresh = self._verify_batch([companies[i] for i in miss_idx], self.batch_size)
+            for i, verification in zip(miss_idx, fresh):
+                verifications[i] = verification
+                # Don't remember fallbacks from failed or unparseable calls
+                if verification.get("status") != "UNCERTAIN":
+                    self._cache_put(keys[i], verification)
         
         valid = []
         rejected = []
@@ -506,18 +754,26 @@ class PublicStatusValidator:
         companies: List[ComparableCompany],
         batch_size: int = 5
     ) -> List[Dict[str, Any]]:
-        """Verify companies in batches."""
-        results = []
+        """Verify companies in batches, running batches concurrently."""
+        batches = [
+            companies[i:i + batch_size]
+            for i in range(0, len(companies), batch_size)
+        ]
+        if not batches:
+            return []
         
-        for i in range(0, len(companies), batch_size):
-            batch = companies[i:i + batch_size]
-            
-            company_list = "\n".join([
-                f"{j+1}. {c.get('name', 'Unknown')} (Ticker: {c.get('ticker', 'N/A')}, Exchange: {c.get('exchange', 'N/A')})"
-                for j, c in enumerate(batch)
-            ])
-            
-            prompt = f"""
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            verified = executor.map(self._verify_chunk, batches)
+            return [result for batch in verified for result in batch]
+    
+    def _verify_chunk(self, batch: List[ComparableCompany]) -> List[Dict[str, Any]]:
+        """Verify one batch of companies with a single LLM call."""
+        company_list = "\n".join([
+            f"{j+1}. {c.get('name', 'Unknown')} (Ticker: {c.get('ticker', 'N/A')}, Exchange: {c.get('exchange', 'N/A')})"
+            for j, c in enumerate(batch)
+        ])
+        
+        prompt = f"""
 Verify CURRENT trading status of each company:
 {company_list}
 
@@ -538,61 +794,32 @@ Return JSON array:
   }}
 ]
 """
+        
+        try:
+            resp = self.client.chat.completions.create(
+                model="gpt-4o",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.1
+            )
             
-            try:
-                resp = self.client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.1
-                )
-                
-                batch_results = self._safe_parse_json(resp.choices[0].message.content)
-                
-                if isinstance(batch_results, list) and len(batch_results) == len(batch):
-                    results.extend(batch_results)
-                else:
-                    # Fallback to uncertain
-                    results.extend([{
-                        "ticker": c.get("ticker", ""),
-                        "is_publicly_traded": None,
-                        "status": "UNCERTAIN",
-                        "confidence": "LOW"
-                    } for c in batch])
-                    
-            except Exception as e:
-                logger.error(f"Error in batch verification: {e}")
-                results.extend([{
-                    "ticker": c.get("ticker", ""),
-                    "is_publicly_traded": None,
-                    "status": "UNCERTAIN",
-                    "confidence": "LOW"
-                } for c in batch])
+            batch_results = self._safe_parse_json(resp.choices[0].message.content)
             
-            if i + batch_size < len(companies):
-                time.sleep(0.5)
-        
-        return results
+            if isinstance(batch_results, list) and len(batch_results) == len(batch):
+                return batch_results
+                
+        except Exception as e:
+            logger.error(f"Error in batch verification: {e}")
+        
+        # Fallback to uncertain
+        return [{
+            "ticker": c.get("ticker", ""),
+            "is_publicly_traded": None,
+            "status": "UNCERTAIN",
+            "confidence": "LOW"
+        } for c in batch]
     
     @staticmethod
     def _safe_parse_json(text: str) -> Any:
         """Parse JSON from LLM response."""
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            text_clean = text.strip()
-            if text_clean.startswith("```"):
-                lines = text_clean.split("\n")
-                text_clean = "\n".join(lines[1:-1])
-            
-            start = text_clean.find("[")
-            end = text_clean.rfind("]")
-            if start != -1 and end != -1:
-                try:
-                    return json.loads(text_clean[start:end + 1])
-                except:
-                    pass
-            
-            return []
-
-if __name__ == "__main__":
-    main()
+        parsed = _extract_json(text)
+        return [] if parsed is None else parsed
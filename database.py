@@ -3,22 +3,72 @@ Database module for persistent storage of comparables searches.
 Uses SQLite for simplicity.
 """
 import sqlite3
-import json
+import threading
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+import orjson
+
+# orjson output is already compact. Numpy scalars (yfinance financials) and
+# non-string keys serialize instead of raising
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a value for a JSON TEXT column."""
+    return orjson.dumps(value, option=JSON_OPTIONS).decode()
+
 
 class Database:
     """Simple SQLite database for comparables data."""
     
     def __init__(self, db_path: str = "comparables.db"):
         self.db_path = db_path
+        # Bumped on every write through this handle; readers can key caches
+        # on it instead of re-querying
+        self.version = 0
+        self._version_lock = threading.Lock()
+        self._local = threading.local()
         self._init_db()
     
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Connection for the calling thread, opened on first use and reused
+        after that. sqlite3 connections can't cross threads, so each thread
+        gets its own. Reuse pays off on long-lived worker threads (API
+        request workers, executor pools); Streamlit starts a new thread per
+        script run, so there it is one connection per run, closed when the
+        thread exits and its thread-local storage is released (or earlier
+        via close()).
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+        return conn
+    
+    def close(self):
+        """Close the calling thread's connection, if it has one."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close()
+    
+    def _bump_version(self):
+        """Mark a write; a locked increment so concurrent saves never share a version."""
+        with self._version_lock:
+            self.version += 1
+    
     def _init_db(self):
         """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            # WAL is persistent in the file: readers no longer block behind
+            # a writer, and commits append instead of rewriting pages
+            conn.execute("PRAGMA journal_mode=WAL")
+            
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS searches (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -86,7 +136,7 @@ class Database:
         Returns:
             search_id: ID of the saved search
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # Save search
@@ -95,45 +145,53 @@ class Database:
                 VALUES (?, ?, ?, ?)
             """, (
                 target_name,
-                json.dumps(target_data),
-                json.dumps(metadata),
+                _dumps(target_data),
+                _dumps(metadata),
                 len(comparables)
             ))
             
             search_id = cursor.lastrowid
             
-            # Save comparables
-            for rank, comp in enumerate(comparables, 1):
-                cursor.execute("""
-                    INSERT INTO comparables (search_id, rank, name, ticker, exchange, validation_score, data)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
+            # Save comparables in one statement
+            cursor.executemany("""
+                INSERT INTO comparables (search_id, rank, name, ticker, exchange, validation_score, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
                     search_id,
                     rank,
                     comp.get('name', ''),
                     comp.get('ticker', ''),
                     comp.get('exchange', ''),
                     comp.get('validation_score', 0.0),
-                    json.dumps(comp)
-                ))
-                
-                # Update companies cache
-                self._update_company_cache(
+                    _dumps(comp)
+                )
+                for rank, comp in enumerate(comparables, 1)
+            ])
+            
+            # Update companies cache in the same transaction
+            verified_at = datetime.now().isoformat()
+            self._upsert_companies(cursor, [
+                (
                     comp.get('name', ''),
                     comp.get('ticker', ''),
                     comp.get('exchange', ''),
-                    is_public=True,
-                    conn=conn
+                    True,
+                    verified_at,
+                    None
                 )
+                for comp in comparables
+            ])
             
             conn.commit()
+            self._bump_version()
             return search_id
     
     def get_recent_searches(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent searches."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             cursor.execute("""
                 SELECT id, target_name, timestamp, num_comparables
@@ -146,9 +204,9 @@ class Database:
     
     def get_search_results(self, search_id: int) -> Optional[Dict[str, Any]]:
         """Get full results for a specific search."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             # Get search info
             cursor.execute("""
@@ -161,8 +219,8 @@ class Database:
             if not row:
                 return None
             
-            target_data = json.loads(row['target_data'])
-            metadata = json.loads(row['metadata'])
+            target_data = orjson.loads(row['target_data'])
+            metadata = orjson.loads(row['metadata'])
             
             # Get comparables
             cursor.execute("""
@@ -172,7 +230,7 @@ class Database:
                 ORDER BY rank
             """, (search_id,))
             
-            comparables = [json.loads(row['data']) for row in cursor.fetchall()]
+            comparables = [orjson.loads(row['data']) for row in cursor.fetchall()]
             
             return {
                 'target': target_data,
@@ -182,14 +240,17 @@ class Database:
     
     def get_stats(self) -> Dict[str, int]:
         """Get database statistics."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
-            cursor.execute("SELECT COUNT(*) FROM searches")
-            total_searches = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(DISTINCT name) FROM companies")
-            unique_companies = cursor.fetchone()[0]
+            # companies.name is UNIQUE, so a plain COUNT(*) is the distinct
+            # count and needs no de-duplication pass
+            cursor.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM searches),
+                    (SELECT COUNT(*) FROM companies)
+            """)
+            total_searches, unique_companies = cursor.fetchone()
             
             return {
                 'total_searches': total_searches,
@@ -198,9 +259,9 @@ class Database:
     
     def search_companies(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
         """Search for companies in the database."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             cursor.execute("""
                 SELECT name, ticker, exchange, is_public, last_verified
@@ -214,9 +275,9 @@ class Database:
     
     def get_company_info(self, ticker: str) -> Optional[Dict[str, Any]]:
         """Get cached company information."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             cursor.execute("""
                 SELECT *
@@ -228,7 +289,7 @@ class Database:
             if row:
                 data = dict(row)
                 if data['verification_data']:
-                    data['verification_data'] = json.loads(data['verification_data'])
+                    data['verification_data'] = orjson.loads(data['verification_data'])
                 return data
             return None
     
@@ -242,37 +303,39 @@ class Database:
         conn: Optional[sqlite3.Connection] = None
     ):
         """Update or insert company in cache."""
-        should_close = False
         if conn is None:
-            conn = sqlite3.connect(self.db_path)
-            should_close = True
+            conn = self._connect()
         
-        try:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO companies (name, ticker, exchange, is_public, last_verified, verification_data)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(name) DO UPDATE SET
-                    ticker = excluded.ticker,
-                    exchange = excluded.exchange,
-                    is_public = excluded.is_public,
-                    last_verified = excluded.last_verified,
-                    verification_data = excluded.verification_data
-            """, (
-                name,
-                ticker,
-                exchange,
-                is_public,
-                datetime.now().isoformat(),
-                json.dumps(verification_data) if verification_data else None
-            ))
-            
-            conn.commit()
-            
-        finally:
-            if should_close:
-                conn.close()
+        self._upsert_companies(conn.cursor(), [(
+            name,
+            ticker,
+            exchange,
+            is_public,
+            datetime.now().isoformat(),
+            _dumps(verification_data) if verification_data else None
+        )])
+        
+        conn.commit()
+        self._bump_version()
+    
+    @staticmethod
+    def _upsert_companies(cursor: sqlite3.Cursor, rows: List[tuple]):
+        """
+        Insert or update company cache rows without committing.
+        
+        Each row is (name, ticker, exchange, is_public, last_verified,
+        verification_data).
+        """
+        cursor.executemany("""
+            INSERT INTO companies (name, ticker, exchange, is_public, last_verified, verification_data)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                ticker = excluded.ticker,
+                exchange = excluded.exchange,
+                is_public = excluded.is_public,
+                last_verified = excluded.last_verified,
+                verification_data = excluded.verification_data
+        """, rows)
 
 
 class SearchHistory:
@@ -288,9 +351,9 @@ class SearchHistory:
     ) -> List[Dict[str, Any]]:
         """Find similar previous searches."""
         # Simple implementation - could be enhanced with fuzzy matching
-        with sqlite3.connect(self.db.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.db._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             cursor.execute("""
                 SELECT id, target_name, timestamp, num_comparables
@@ -307,9 +370,9 @@ class SearchHistory:
         limit: int = 20
     ) -> List[Dict[str, Any]]:
         """Get companies that appear most frequently as comparables."""
-        with sqlite3.connect(self.db.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.db._connect() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             cursor.execute("""
                 SELECT 
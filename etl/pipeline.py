@@ -113,6 +113,16 @@ class FinancialETLPipeline:
         self.retry_delay = retry_delay
         self.etl_metrics = ETLMetrics()
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """Release the enricher's worker threads."""
+        self.enricher.close()
+    
     @log_execution(logger, include_args=False, include_result=False)
     def run(self, companies: List[Dict]) -> ETLResult:
         """Execute the full ETL pipeline with tracing."""
@@ -363,8 +373,8 @@ def run_financial_etl(
     db_path: str = "comparables.db"
 ) -> Dict[str, Any]:
     """Run financial ETL pipeline."""
-    pipeline = FinancialETLPipeline(db_path=db_path)
-    result = pipeline.run(companies)
+    with FinancialETLPipeline(db_path=db_path) as pipeline:
+        result = pipeline.run(companies)
     return result.to_dict()
 
 
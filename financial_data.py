@@ -5,8 +5,10 @@ Fetches real-time financial data from Yahoo Finance and enriches company records
 
 import yfinance as yf
 from typing import Dict, Any, List, Optional
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 class FinancialDataEnricher:
     """Enriches company data with real-time financial metrics from Yahoo Finance"""
@@ -48,14 +50,48 @@ class FinancialDataEnricher:
         'PEN': 0.27,     # 1 PEN = 0.27 USD
     }
     
-    def __init__(self, max_workers: int = 5):
+    CACHE_MAX_SIZE = 2048
+    
+    def __init__(self, max_workers: int = 5, cache_ttl: float = 900):
         """
         Initialize the enricher
         
         Args:
             max_workers: Maximum number of concurrent API requests
+            cache_ttl: Seconds a fetched ticker's financials are reused
         """
         self.max_workers = max_workers
+        self.cache_ttl = cache_ttl
+        # full ticker -> (monotonic time, financials), least recently used
+        # first; failed fetches are not cached. Worker threads write it.
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Worker threads are kept between batches rather than respawned per
+        # call; the pool is started on first use and released by close()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """Shut down the worker pool; a later batch starts a new one"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """The shared worker pool, started on first use"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="enrich"
+                )
+            return self._executor
     
     def convert_to_usd(self, amount: float, currency: str) -> float:
         """
@@ -122,6 +158,11 @@ class FinancialDataEnricher:
         # Construct full ticker symbol based on exchange
         full_ticker = self._construct_ticker(ticker_symbol, exchange)
         
+        cached = self._cached_financials(full_ticker)
+        if cached is not None:
+            company['financials'] = cached
+            return company
+        
         try:
             # Fetch data from Yahoo Finance
             ticker = yf.Ticker(full_ticker)
@@ -165,6 +206,7 @@ class FinancialDataEnricher:
             }
             
             company['financials'] = financials
+            self._cache_put(full_ticker, financials)
             
         except Exception as e:
             print(f"Warning: Could not fetch financial data for {ticker_symbol} ({exchange}): {e}")
@@ -175,6 +217,26 @@ class FinancialDataEnricher:
         
         return company
     
+    def _cached_financials(self, full_ticker: str) -> Optional[Dict[str, Any]]:
+        """Copy of a ticker's financials if fetched within the TTL, else None"""
+        with self._cache_lock:
+            cached = self._cache.get(full_ticker)
+            if cached is None:
+                return None
+            if time.monotonic() - cached[0] >= self.cache_ttl:
+                del self._cache[full_ticker]
+                return None
+            self._cache.move_to_end(full_ticker)
+            return dict(cached[1])
+    
+    def _cache_put(self, full_ticker: str, financials: Dict[str, Any]):
+        """Store a copy of a ticker's financials, evicting the least recently used past the size cap"""
+        with self._cache_lock:
+            self._cache[full_ticker] = (time.monotonic(), dict(financials))
+            self._cache.move_to_end(full_ticker)
+            while len(self._cache) > self.CACHE_MAX_SIZE:
+                self._cache.popitem(last=False)
+    
     def _construct_ticker(self, ticker: str, exchange: str) -> str:
         """
         Construct full ticker symbol based on exchange
@@ -239,33 +301,49 @@ class FinancialDataEnricher:
         Returns:
             List of enriched company dictionaries
         """
-        enriched = []
+        if not companies:
+            return []
         
-        # Use ThreadPoolExecutor for parallel API calls
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_company = {
-                executor.submit(self.enrich_company, company): company 
-                for company in companies
-            }
+        # Only tickers without fresh cached data go to Yahoo Finance, each
+        # fetched once however many companies in the batch share it
+        full_tickers = [
+            self._construct_ticker(c['ticker'], c.get('exchange', '')) if c.get('ticker') else None
+            for c in companies
+        ]
+        pending = {}
+        for company, full_ticker in zip(companies, full_tickers):
+            if full_ticker and full_ticker not in pending and self._cached_financials(full_ticker) is None:
+                pending[full_ticker] = company
+        
+        # Parallel API calls on the shared pool - the calls are I/O bound, so
+        # every ticker can be in flight at once up to max_workers
+        executor = self._get_executor()
+        futures = {
+            full_ticker: executor.submit(self.enrich_company, dict(company))
+            for full_ticker, company in pending.items()
+        }
+        fetched = {}
+        for full_ticker, future in futures.items():
+            try:
+                fetched[full_ticker] = future.result()['financials']
+            except Exception as e:
+                fetched[full_ticker] = {'data_quality': 'error', 'error': str(e)}
+        
+        # Assemble in input order so the ranking is preserved
+        enriched = []
+        for i, (company, full_ticker) in enumerate(zip(companies, full_tickers), 1):
+            financials = fetched.get(full_ticker) if full_ticker else None
+            if financials is not None:
+                company['financials'] = dict(financials)
+            else:
+                self.enrich_company(company)
+            enriched.append(company)
             
-            # Collect results as they complete
-            for i, future in enumerate(as_completed(future_to_company), 1):
-                try:
-                    enriched_company = future.result()
-                    enriched.append(enriched_company)
-                    
-                    if show_progress:
-                        print(f"✓ Enriched {i}/{len(companies)}: {enriched_company['name']}")
-                        
-                except Exception as e:
-                    # If enrichment fails, add the original company
-                    company = future_to_company[future]
-                    company['financials'] = {'data_quality': 'error', 'error': str(e)}
-                    enriched.append(company)
-                    
-                    if show_progress:
-                        print(f"✗ Failed {i}/{len(companies)}: {company['name']} - {e}")
+            if show_progress:
+                if company['financials'].get('error'):
+                    print(f"✗ Failed {i}/{len(companies)}: {company['name']} - {company['financials']['error']}")
+                else:
+                    print(f"✓ Enriched {i}/{len(companies)}: {company['name']}")
         
         return enriched
 
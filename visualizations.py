@@ -3,13 +3,34 @@ Advanced visualization module for CompIQ.
 Creates interactive charts and comparison views.
 """
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import pandas as pd
-from typing import Dict, Any, List
+import numpy as np
+from bisect import bisect_right
+from html import escape
+from typing import Dict, Any, List, Optional
 import streamlit as st
 
 
+# Score tiers: bisect_right against SCORE_THRESHOLDS indexes SCORE_EMOJIS
+SCORE_THRESHOLDS = (3.0, 5.0)
+SCORE_EMOJIS = ("🔴", "🟡", "🟢")
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Numeric value of a metric that may be stored as text ("3.45", "N/A")."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _upper_median(values: np.ndarray) -> Optional[float]:
+    """Upper median (the middle element after sorting), None when empty."""
+    if not values.size:
+        return None
+    return float(np.partition(values, values.size // 2)[values.size // 2])
+
+
 class CompIQVisualizer:
     """Creates professional visualizations for comparable analysis."""
     
@@ -53,8 +74,6 @@ class CompIQVisualizer:
         Create bubble chart comparing market cap vs. revenue multiple.
         With jitter to prevent overlapping dots.
         """
-        import numpy as np
-        
         data = []
         
         for comp in comparables:
@@ -80,6 +99,9 @@ class CompIQVisualizer:
         if not data:
             return None
         
+        # plotly.express is a heavy import and only this chart uses it
+        import plotly.express as px
+        
         df = pd.DataFrame(data)
         
         # Add small random jitter to prevent exact overlaps (5% of value)
@@ -193,7 +215,7 @@ class CompIQVisualizer:
                 'Score': f"{comp.get('validation_score', 0):.2f}",
                 'Market Cap': fin.get('market_cap_formatted', 'N/A'),
                 'Revenue (TTM)': fin.get('revenue_ttm_formatted', 'N/A'),
-                'EV/Revenue': f"{fin.get('ev_to_revenue', 0):.2f}x" if fin.get('ev_to_revenue') else 'N/A',
+                'EV/Revenue': f"{_to_float(fin.get('ev_to_revenue')):.2f}x" if _to_float(fin.get('ev_to_revenue')) else 'N/A',
                 'Revenue Growth': f"{fin.get('revenue_growth', 0) * 100:.1f}%" if fin.get('revenue_growth') else 'N/A',
                 'Profit Margin': f"{fin.get('profit_margin', 0) * 100:.1f}%" if fin.get('profit_margin') else 'N/A',
             }
@@ -209,38 +231,26 @@ class CompIQVisualizer:
         """
         Create summary statistics for the peer group.
         """
-        ev_revenues = []
-        market_caps = []
-        revenue_growths = []
+        fins = [comp.get('financials') or {} for comp in comparables]
         
-        for comp in comparables:
-            fin = comp.get('financials', {})
-            
-            if fin.get('ev_to_revenue'):
-                ev_revenues.append(fin['ev_to_revenue'])
-            
-            if fin.get('market_cap'):
-                market_caps.append(fin['market_cap'])
-            
-            if fin.get('revenue_growth'):
-                revenue_growths.append(fin['revenue_growth'] * 100)
+        # ev_to_revenue is stored as a formatted string; compare it as a number
+        ev_revenues = np.array(
+            [v for v in (_to_float(fin.get('ev_to_revenue')) for fin in fins) if v],
+            dtype=float
+        )
+        market_caps = np.array([fin['market_cap'] for fin in fins if fin.get('market_cap')], dtype=float)
+        revenue_growths = np.array(
+            [fin['revenue_growth'] for fin in fins if fin.get('revenue_growth')],
+            dtype=float
+        ) * 100
         
         summary = {
-            'median_ev_revenue': None,
-            'median_market_cap': None,
-            'median_revenue_growth': None,
-            'sample_size': len([c for c in comparables if c.get('financials', {}).get('market_cap')])
+            'median_ev_revenue': _upper_median(ev_revenues),
+            'median_market_cap': _upper_median(market_caps),
+            'median_revenue_growth': _upper_median(revenue_growths),
+            'sample_size': int(market_caps.size)
         }
         
-        if ev_revenues:
-            summary['median_ev_revenue'] = sorted(ev_revenues)[len(ev_revenues) // 2]
-        
-        if market_caps:
-            summary['median_market_cap'] = sorted(market_caps)[len(market_caps) // 2]
-        
-        if revenue_growths:
-            summary['median_revenue_growth'] = sorted(revenue_growths)[len(revenue_growths) // 2]
-        
         return summary
     
     @staticmethod
@@ -287,75 +297,119 @@ class CompIQVisualizer:
         return fig
 
 
-def render_comparison_matrix(
-    comparables: List[Dict[str, Any]], 
+# Comparison matrix markup: one st.html block for the whole top-N grid
+# instead of a column, metrics and an expander per company
+MATRIX_COLUMN_TEMPLATE = (
+    '<div style="flex: 1; min-width: 0;">'
+    '<h3 style="margin: 0 0 0.25rem 0;">{rank}. {name}</h3>'
+    '<div><b>{ticker}</b> • {exchange}</div>'
+    '{score}<hr style="margin: 0.75rem 0;">{metrics}'
+    '<details style="margin-top: 0.5rem;"><summary>📊 Details</summary><ul>'
+    '<li><b>Sector:</b> {sector}</li><li><b>Industry:</b> {industry}</li>'
+    '<li><b>Employees:</b> {employees}</li><li><b>Website:</b> {url}</li>'
+    '</ul></details></div>'
+)
+MATRIX_METRIC_TEMPLATE = (
+    '<div style="margin-top: 0.5rem;"><div style="font-size: 0.875rem; opacity: 0.7;">{label}</div>'
+    '<div style="font-size: 1.75rem;">{value}</div>{delta}</div>'
+)
+MATRIX_DELTA_TEMPLATE = '<div style="color: #09ab3b; font-size: 0.875rem;">↑ {value}</div>'
+
+
+def _matrix_metric(label: str, value: str, delta: str = "") -> str:
+    """One metric block of the comparison matrix."""
+    return MATRIX_METRIC_TEMPLATE.format(
+        label=label,
+        value=escape(value),
+        delta=MATRIX_DELTA_TEMPLATE.format(value=escape(delta)) if delta else ""
+    )
+
+
+def build_comparison_matrix_html(
+    comparables: List[Dict[str, Any]],
     top_n: int = 5
-):
-    """
-    Render side-by-side comparison of top N companies.
-    Streamlit component.
-    """
+) -> str:
+    """HTML for the side-by-side comparison of the top N companies."""
     top_comps = sorted(
         comparables,
         key=lambda x: x.get('validation_score', 0),
         reverse=True
     )[:top_n]
     
-    st.subheader(f"🔬 Top {len(top_comps)} Comparables - Detailed Comparison")
+    columns = []
+    for idx, comp in enumerate(top_comps):
+        fin = comp.get('financials') or {}
+        
+        score = comp.get('validation_score', 0)
+        score_color = SCORE_EMOJIS[bisect_right(SCORE_THRESHOLDS, score)]
+        
+        # Financial metrics
+        metrics = []
+        if fin.get('market_cap_formatted'):
+            metrics.append(_matrix_metric("Market Cap", fin['market_cap_formatted']))
+        
+        if fin.get('revenue_ttm_formatted'):
+            metrics.append(_matrix_metric("Revenue (TTM)", fin['revenue_ttm_formatted']))
+        
+        if fin.get('ev_to_revenue'):
+            ev_val = fin['ev_to_revenue']
+            if isinstance(ev_val, str):
+                metrics.append(_matrix_metric("EV/Revenue", f"{ev_val}x"))
+            else:
+                metrics.append(_matrix_metric("EV/Revenue", f"{ev_val:.2f}x"))
+        
+        if fin.get('revenue_growth'):
+            growth = fin['revenue_growth'] * 100
+            metrics.append(_matrix_metric(
+                "Revenue Growth",
+                f"{growth:.1f}%",
+                delta=f"{growth:.1f}%" if growth > 0 else ""
+            ))
+        
+        columns.append(MATRIX_COLUMN_TEMPLATE.format(
+            rank=idx + 1,
+            name=escape(comp.get('name', 'Unknown')[:15]),
+            ticker=escape(str(comp.get('ticker', 'N/A'))),
+            exchange=escape(str(comp.get('exchange', 'N/A'))),
+            score=_matrix_metric("Match Score", f"{score:.2f} {score_color}"),
+            metrics="".join(metrics),
+            sector=escape(str(fin.get('sector', 'N/A'))),
+            industry=escape(str(fin.get('industry', 'N/A'))),
+            employees=f"{fin['employees']:,}" if fin.get('employees') else "N/A",
+            url=escape(str(comp.get('url', 'N/A')))
+        ))
     
-    # Create columns for each company
-    cols = st.columns(len(top_comps))
+    return f'<div style="display: flex; gap: 1rem;">{"".join(columns)}</div>'
+
+
+def render_comparison_matrix(
+    comparables: List[Dict[str, Any]], 
+    top_n: int = 5,
+    html: Optional[str] = None
+):
+    """
+    Render side-by-side comparison of top N companies.
+    Streamlit component. Pass prebuilt html (build_comparison_matrix_html)
+    to skip rebuilding it.
+    """
+    st.subheader(f"🔬 Top {min(top_n, len(comparables))} Comparables - Detailed Comparison")
     
-    for idx, comp in enumerate(top_comps):
-        with cols[idx]:
-            fin = comp.get('financials', {})
-            
-            st.markdown(f"### {idx + 1}. {comp.get('name', 'Unknown')[:15]}")
-            st.markdown(f"**{comp.get('ticker', 'N/A')}** • {comp.get('exchange', 'N/A')}")
-            
-            score = comp.get('validation_score', 0)
-            score_color = "🟢" if score >= 5.0 else "🟡" if score >= 3.0 else "🔴"
-            st.metric("Match Score", f"{score:.2f} {score_color}")
-            
-            st.markdown("---")
-            
-            # Financial metrics
-            if fin.get('market_cap_formatted'):
-                st.metric("Market Cap", fin['market_cap_formatted'])
-            
-            if fin.get('revenue_ttm_formatted'):
-                st.metric("Revenue (TTM)", fin['revenue_ttm_formatted'])
-            
-            if fin.get('ev_to_revenue'):
-                ev_val = fin['ev_to_revenue']
-                if isinstance(ev_val, str):
-                    st.metric("EV/Revenue", f"{ev_val}x")
-                else:
-                    st.metric("EV/Revenue", f"{ev_val:.2f}x")
-            
-            if fin.get('revenue_growth'):
-                growth = fin['revenue_growth'] * 100
-                st.metric(
-                    "Revenue Growth", 
-                    f"{growth:.1f}%",
-                    delta=f"{growth:.1f}%" if growth > 0 else None
-                )
-            
-            # Business info
-            with st.expander("📊 Details"):
-                st.write(f"**Sector:** {fin.get('sector', 'N/A')}")
-                st.write(f"**Industry:** {fin.get('industry', 'N/A')}")
-                st.write(f"**Employees:** {fin.get('employees', 'N/A'):,}" if fin.get('employees') else "**Employees:** N/A")
-                st.write(f"**Website:** {comp.get('url', 'N/A')}")
+    if html is None:
+        html = build_comparison_matrix_html(comparables, top_n=top_n)
+    st.html(html)
 
 
-def render_financial_summary(comparables: List[Dict[str, Any]]):
+def render_financial_summary(
+    comparables: List[Dict[str, Any]],
+    summary: Optional[Dict[str, Any]] = None
+):
     """
     Render financial summary metrics for peer group.
-    No header - app.py adds it.
+    No header - app.py adds it. Pass a precomputed summary to skip
+    recomputing it.
     """
-    visualizer = CompIQVisualizer()
-    summary = visualizer.create_valuation_summary_card(comparables)
+    if summary is None:
+        summary = CompIQVisualizer.create_valuation_summary_card(comparables)
     
     col1, col2, col3, col4 = st.columns(4)
     